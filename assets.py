@@ -0,0 +1,57 @@
+"""Logos and other images embedded in the page, resized once and base64-encoded.
+
+Paths are resolved relative to the app folder. :func:`thumbnail_data`
+shrinks an image to the size it is displayed at (times ``scale``, for
+hover zoom and high-DPI screens) before encoding it, so the page never
+ships the full-resolution file; the page caches the result per file
+modification time.
+"""
+import base64
+import io
+from pathlib import Path
+
+from PIL import Image
+
+APP_DIR = Path(__file__).resolve().parent
+
+LOGO = "logo2.jpg"
+FOOTER_LOGO = "img-2.png"
+
+
+def asset_path(name):
+    """``name`` resolved against the app folder (absolute paths are kept)."""
+    return APP_DIR / name
+
+
+def asset_version(path):
+    """Modification time of ``path`` in ns, or ``None`` if it does not exist; used as a cache key."""
+    try:
+        return Path(path).stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def thumbnail_data(path, display_px, scale=2):
+    """``(mime_type, base64)`` of ``path`` shrunk to fit ``display_px * scale`` pixels.
+
+    Images that are already small enough are passed through unchanged.
+    Resized images with transparency are written as PNG, everything else
+    as JPEG; if that comes out larger than the original file (a small,
+    well-compressed original), the original is passed through instead.
+    """
+    original = Path(path).read_bytes()
+    with Image.open(io.BytesIO(original)) as image:
+        original_type = Image.MIME.get(image.format, "image/png")
+        if max(image.size) <= display_px * scale:
+            return original_type, base64.b64encode(original).decode()
+        image.thumbnail((display_px * scale, display_px * scale), Image.LANCZOS)
+        buffer = io.BytesIO()
+        if image.mode in ("RGBA", "LA", "P"):
+            image.save(buffer, format="PNG", optimize=True)
+            mime_type = "image/png"
+        else:
+            image.convert("RGB").save(buffer, format="JPEG", quality=85, optimize=True)
+            mime_type = "image/jpeg"
+    if buffer.tell() >= len(original):
+        return original_type, base64.b64encode(original).decode()
+    return mime_type, base64.b64encode(buffer.getvalue()).decode()
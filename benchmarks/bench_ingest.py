@@ -0,0 +1,51 @@
+"""Compare the original python-engine CSV parse with the fast Arrow path, and report frame memory.
+
+    python benchmarks/bench_ingest.py --rows 1000000
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.synthetic import write_sheet  # noqa: E402
+from qa_data import categorical_cols, parse_csv_bytes, parse_csv_fast  # noqa: E402
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_sheet(Path(tmp) / "sheet.csv", args.rows)
+        raw = path.read_bytes()
+
+    print(f"{args.rows:,} rows, {len(raw) / 1e6:.1f} MB of CSV")
+    python_s, _ = best_of(lambda: parse_csv_bytes(raw), args.repeat)
+    fast_s, (fast, bad) = best_of(lambda: parse_csv_fast(raw), args.repeat)
+    print(f"python engine : {python_s:8.3f} s")
+    print(f"fast (arrow)  : {fast_s:8.3f} s  ({len(bad)} quarantined lines)")
+    print(f"speed-up      : {python_s / fast_s:8.1f}x")
+
+    as_text = fast.astype({col: object for col in categorical_cols if col in fast.columns})
+    text_mb = as_text.memory_usage(deep=True).sum() / 1e6
+    categorical_mb = fast.memory_usage(deep=True).sum() / 1e6
+    print(f"memory        : {text_mb:8.1f} MB as object strings -> {categorical_mb:.1f} MB with categoricals"
+          f" ({text_mb / categorical_mb:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
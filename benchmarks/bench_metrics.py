@@ -0,0 +1,162 @@
+"""Time the metrics module against the page's original per-status scans.
+
+The original page scanned the month's rows once per number: three boolean
+scans for the KPI counts, three filtered ``value_counts`` for qa_summary,
+two groupbys for the daily charts and one for the frequency summary. The
+metrics module groups the month's cube slice once (``status_crosstab``)
+and reduces that table for every number. The legacy side starts from the
+page's original python-engine parse, so both sides see the same raw sheet;
+``tests/test_metrics.py`` checks the numbers match.
+
+    python benchmarks/bench_metrics.py --rows 1000000
+"""
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.synthetic import make_sheet  # noqa: E402
+from metrics import (  # noqa: E402
+    build_cube, month_slice, status_crosstab, compute_kpis, compute_qa_summary,
+    compute_daily_counts, compute_daily_status, compute_frequency_summary,
+    done_str, reject_str, revised_str,
+)
+from qa_data import parse_csv_fast, status_col, qa_col, dept_col, qa_status_date_col, frequency_col, date_col  # noqa: E402
+
+
+def legacy_frame(raw):
+    """The page's original parse of the sheet CSV: python engine, header names trimmed, no typing."""
+    df = pd.read_csv(io.BytesIO(raw), on_bad_lines='skip', engine='python')
+    df.columns = [col.strip() for col in df.columns]
+    return df
+
+
+def legacy_rows(df, dept):
+    """The page's original preprocessing, for one department."""
+    df = df[df[dept_col].astype(str).str.strip().str.upper() == dept.upper()].copy()
+    df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
+    df[qa_status_date_col] = pd.to_datetime(df[qa_status_date_col], errors='coerce')
+    df = df.dropna(subset=[date_col, qa_status_date_col])
+    df["Month"] = df[date_col].dt.to_period("M").astype(str)
+    df[status_col] = df[status_col].astype(str).str.strip().str.lower()
+    return df
+
+
+def legacy_metrics(df, month):
+    """The page's original month computations, verbatim apart from returning the results."""
+    filtered = df[df["Month"] == month]
+    done_count = (filtered[status_col] == done_str).sum()
+    revised_count = (filtered[status_col] == revised_str).sum()
+    reject_count = (filtered[status_col] == reject_str).sum()
+    total = len(filtered)
+
+    done_counts = filtered[filtered[status_col] == done_str][qa_col].value_counts().rename("Done Count")
+    reject_counts = filtered[filtered[status_col] == reject_str][qa_col].value_counts().rename("Reject Count")
+    revised_counts = filtered[filtered[status_col] == revised_str][qa_col].value_counts().rename("Revised Count")
+    qa_summary = pd.concat([done_counts, reject_counts, revised_counts], axis=1).fillna(0).reset_index()
+    qa_summary['Total'] = qa_summary['Done Count'] + qa_summary['Reject Count'] + qa_summary['Revised Count']
+    qa_summary['Rejection Rate (%)'] = np.where(
+        qa_summary['Total'] > 0, (qa_summary['Reject Count'] / qa_summary['Total']) * 100, 0.0
+    ).round(1)
+
+    filtered = filtered.copy()
+    filtered["QA Status Date Only"] = filtered[qa_status_date_col].dt.date
+    filtered["QA Status Month"] = filtered[qa_status_date_col].dt.to_period("M").astype(str)
+    month_only = filtered[filtered["QA Status Month"] == month]
+    daily_counts = month_only.groupby("QA Status Date Only").size().reset_index(name='File Count')
+
+    breakdown = month_only.groupby(["QA Status Date Only", status_col]).size().reset_index(name="Count")
+    breakdown = breakdown[breakdown[status_col].isin([done_str, reject_str])]
+    pivot_daily = breakdown.pivot(index="QA Status Date Only", columns=status_col, values="Count").fillna(0)
+    for col in [done_str, reject_str]:
+        if col not in pivot_daily.columns:
+            pivot_daily[col] = 0
+    pivot_daily["Average"] = pivot_daily.mean(axis=1)
+
+    filtered[frequency_col] = filtered[frequency_col].astype(str).str.strip()
+    summary = filtered.groupby(frequency_col)[status_col].value_counts().unstack(fill_value=0).reset_index()
+    summary["Total File"] = summary[[done_str, reject_str]].sum(axis=1)
+    summary["FTR%"] = (summary[done_str] / summary["Total File"] * 100).round(0).astype(int)
+    summary["Iteration%"] = (summary[reject_str] / summary["Total File"] * 100).round(0).astype(int)
+
+    kpis = {"total": total, "done": done_count, "revised": revised_count, "reject": reject_count}
+    return kpis, qa_summary, daily_counts, pivot_daily, summary
+
+
+def cube_metrics(table, month):
+    return (
+        compute_kpis(table),
+        compute_qa_summary(table),
+        compute_daily_counts(table, month),
+        compute_daily_status(table, month),
+        compute_frequency_summary(table),
+    )
+
+
+def plain(frame):
+    """``frame`` with categorical columns as plain objects, for comparison with the legacy output."""
+    return frame.astype({col: object for col in frame.columns if isinstance(frame[col].dtype, pd.CategoricalDtype)})
+
+
+def assert_same(legacy, new):
+    kpis, qa_summary, daily_counts, pivot_daily, summary = legacy
+    new_kpis, new_qa, new_daily, new_pivot, new_summary = new
+    qa_summary, new_qa, new_summary = plain(qa_summary), plain(new_qa), plain(new_summary)
+    assert all(kpis[k] == new_kpis[k] for k in kpis), (kpis, new_kpis)
+
+    by_qa = [qa_col, "Done Count", "Reject Count", "Revised Count", "Total", "Rejection Rate (%)"]
+    pd.testing.assert_frame_equal(
+        qa_summary[by_qa].sort_values(qa_col).reset_index(drop=True),
+        new_qa[by_qa].sort_values(qa_col).reset_index(drop=True),
+        check_dtype=False,
+    )
+    pd.testing.assert_frame_equal(daily_counts, new_daily, check_dtype=False)
+    cols = [done_str, reject_str, "Average"]
+    pd.testing.assert_frame_equal(pivot_daily[cols], new_pivot[cols], check_dtype=False, check_names=False)
+    cols = [frequency_col, "Total File", "FTR%", "Iteration%"]
+    pd.testing.assert_frame_equal(summary[cols], new_summary[cols], check_dtype=False, check_names=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--months", type=int, default=6, help="most recent months to check and time")
+    args = parser.parse_args()
+
+    raw = make_sheet(args.rows).to_csv(index=False).encode()
+    legacy_sheet = legacy_frame(raw)
+    sheet, _ = parse_csv_fast(raw)
+    start = time.perf_counter()
+    cube = build_cube(sheet)
+    cube_s = time.perf_counter() - start
+    print(f"{args.rows:,} rows -> {len(cube.counts):,} cube cells in {cube_s:.3f} s (once per data version)")
+
+    for dept in ["QC", "QA"]:
+        rows = legacy_rows(legacy_sheet, dept)
+        months = sorted(rows["Month"].unique())[-args.months:]
+        legacy_s = slice_s = new_s = 0.0
+        for month in months:
+            start = time.perf_counter()
+            legacy = legacy_metrics(rows, month)
+            legacy_s += time.perf_counter() - start
+            start = time.perf_counter()
+            counts = month_slice(cube, dept, month)
+            slice_s += time.perf_counter() - start
+            start = time.perf_counter()
+            new = cube_metrics(status_crosstab(counts), month)
+            new_s += time.perf_counter() - start
+            assert_same(legacy, new)
+        n = len(months)
+        print(f"{dept}: {n} months identical | "
+              f"legacy per-status scans {legacy_s / n * 1000:7.1f} ms/month | "
+              f"cube slice {slice_s / n * 1000:7.1f} ms + 1 pass {new_s / n * 1000:7.1f} ms/month")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Time every stage of the dashboard pipeline on synthetic sheets of growing size.
+
+Stages, in page order: loading the sheet (download/parse/snapshot, from a
+cold snapshot folder), preprocessing (the count cube), month filtering,
+the month crosstab, the KPI counts, qa_summary, the daily counts,
+pivot_daily, the frequency summary and building the Plotly figures.
+Month stages run on the most recent month of the ``QC`` department.
+
+Results are printed and written as JSON; pass an earlier results file to
+``--compare`` to print the ratio per stage.
+
+    python benchmarks/bench_stages.py --out bench_stages.json
+    python benchmarks/bench_stages.py --rows 10000 100000 --compare bench_stages.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.synthetic import write_sheet  # noqa: E402
+from charts import daily_trend_figure, daily_status_figure, frequency_figure  # noqa: E402
+from metrics import (  # noqa: E402
+    build_cube, available_months, month_slice, status_crosstab, compute_kpis, compute_qa_summary,
+    compute_daily_counts, compute_daily_status, compute_frequency_summary,
+)
+from qa_data import load_sheet  # noqa: E402
+
+DEPT = "QC"
+
+
+def timed(fn, repeat):
+    """``(timings, result)`` for ``repeat`` calls of ``fn``."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return timings, result
+
+
+def run(rows, repeat, tmp):
+    """Stage timings for one sheet size, as a list of result records."""
+    path = write_sheet(Path(tmp) / f"sheet_{rows}.csv", rows)
+    records = []
+
+    def stage(name, fn):
+        timings, result = timed(fn, repeat)
+        records.append({
+            "rows": rows,
+            "stage": name,
+            "best_s": min(timings),
+            "median_s": statistics.median(timings),
+            "repeat": repeat,
+        })
+        return result
+
+    snapshots = iter(range(repeat))
+    df, _ = stage("load_data", lambda: load_sheet(str(path), snapshot_dir=Path(tmp) / f"snap_{rows}_{next(snapshots)}"))
+    cube = stage("preprocessing", lambda: build_cube(df))
+    month = available_months(cube, DEPT)[-1]
+    counts = stage("month_filter", lambda: month_slice(cube, DEPT, month))
+    table = stage("crosstab", lambda: status_crosstab(counts))
+    stage("kpis", lambda: compute_kpis(table))
+    stage("qa_summary", lambda: compute_qa_summary(table))
+    daily_counts = stage("daily_counts", lambda: compute_daily_counts(table, month))
+    pivot_daily = stage("pivot_daily", lambda: compute_daily_status(table, month))
+    summary = stage("frequency_summary", lambda: compute_frequency_summary(table))
+    stage("figures", lambda: (
+        daily_trend_figure(daily_counts), daily_status_figure(pivot_daily), frequency_figure(summary)
+    ))
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", default="bench_stages.json", help="JSON results file")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    records = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            records += run(rows, args.repeat, tmp)
+
+    results = pd.DataFrame(records)
+    table = results.pivot(index="stage", columns="rows", values="best_s").reindex(results["stage"].unique())
+    print("best of", args.repeat, "(ms)")
+    print((table * 1000).round(2).to_string())
+
+    if args.compare:
+        before = pd.DataFrame(json.loads(Path(args.compare).read_text())["results"])
+        before = before.pivot(index="stage", columns="rows", values="best_s")
+        print(f"\nratio to {args.compare} (< 1 is faster)")
+        print((table / before).reindex(table.index).dropna(axis=1, how="all").round(2).to_string())
+
+    Path(args.out).write_text(json.dumps({
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "machine": platform.platform(),
+        },
+        "results": records,
+    }, indent=2))
+    print(f"\nresults written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
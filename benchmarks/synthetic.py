@@ -0,0 +1,54 @@
+"""Synthetic sheets shaped like the published QA Google Sheet.
+
+Used by the benchmark scripts in this folder; nothing here is imported by
+the dashboard itself.
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from qa_data import (  # noqa: E402
+    project_col, date_col, status_col, feed_site_col, qa_col, dept_col,
+    qa_status_date_col, frequency_col,
+)
+
+STATUSES = ["QA Done", "QA Rejected", "QA Done/Revised", " qa done ", "In Progress"]
+STATUS_WEIGHTS = [0.55, 0.20, 0.15, 0.05, 0.05]
+DEPARTMENTS = ["QC", "QA", " qc", "Dev"]
+DEPT_WEIGHTS = [0.45, 0.40, 0.10, 0.05]
+FREQUENCIES = ["Daily", "Weekly", " Monthly", "Adhoc"]
+
+
+def make_sheet(rows, seed=0, start="2023-01-01", days=900, n_qa=30, bad_date_rate=0.01):
+    """Return a DataFrame with the sheet's columns (header spacing included)."""
+    rng = np.random.default_rng(seed)
+    come = pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, days, rows), unit="D")
+    done = come + pd.to_timedelta(rng.integers(0, 5, rows), unit="D")
+    df = pd.DataFrame({
+        project_col + " ": rng.choice([f"Project {i}" for i in range(50)], rows),
+        date_col: come.strftime("%m/%d/%Y"),
+        status_col: rng.choice(STATUSES, rows, p=STATUS_WEIGHTS),
+        feed_site_col: rng.choice([f"site{i}.com" for i in range(200)], rows),
+        qa_col: rng.choice([f"Reviewer {i}" for i in range(n_qa)] + [None], rows),
+        dept_col: rng.choice(DEPARTMENTS, rows, p=DEPT_WEIGHTS),
+        qa_status_date_col: done.strftime("%m/%d/%Y"),
+        frequency_col: rng.choice(FREQUENCIES, rows),
+        "Remarks": rng.choice(["", "Checked", "Sent back to dev"], rows),
+    })
+    df.loc[rng.random(rows) < bad_date_rate, date_col] = "TBD"
+    df.loc[rng.random(rows) < bad_date_rate, qa_status_date_col] = ""
+    return df
+
+
+def write_sheet(path, rows, seed=0, **kwargs):
+    """Write a synthetic sheet to ``path`` as CSV and return the path."""
+    make_sheet(rows, seed=seed, **kwargs).to_csv(path, index=False)
+    return path
+
+
+if __name__ == "__main__":
+    write_sheet(sys.argv[2] if len(sys.argv) > 2 else "synthetic_sheet.csv", int(sys.argv[1]))
@@ -0,0 +1,377 @@
+"""Figures and tables drawn on the Monthly QA Dashboard.
+
+Each builder takes a piece of a :func:`metrics.month_report` and returns a
+Plotly figure, Highcharts options or a DataFrame, without touching
+Streamlit, so the page and the static exporter draw the same charts.
+"""
+import json
+from pathlib import Path
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from metrics import bucket_daily_counts, bucket_daily_status, daily_point_budget, day_col, done_str, reject_str
+from qa_data import frequency_col
+
+CARD_BG = "rgba(255, 255, 255, 255)"
+PLOT_BG = "#e6f0ff"
+DEEP_VIOLET = "#290660"
+DONE_COLOR = "#0d6efd"
+REJECTED_COLOR = "#ff5733"
+AVG_COLOR = "#9b59b6"  # Purple line for Average
+OTHERS_DONE_COLOR = "#a3cfbb"  # Muted Done/Reject for the "others" bar
+OTHERS_REJECT_COLOR = "#f1aeb5"
+
+HIGHCHARTS_CDN = "https://code.highcharts.com"
+# Served by Streamlit's static file serving at app/static/highcharts/;
+# ``python fetch_assets.py`` downloads them.
+HIGHCHARTS_DIR = Path(__file__).resolve().parent / "static" / "highcharts"
+HIGHCHARTS_FILES = ["highcharts.js", "highcharts-3d.js", "modules/exporting.js"]
+
+
+# --- Plotly figures ---
+# x axis label and tick format per time bucket (see metrics.time_bucket).
+_bucket_axes = {
+    "day": ("Date", "%b %d"),  # Example: Oct 01, every day
+    "week": ("Week of", "%b %d"),
+    "month": ("Month", "%b %Y"),
+}
+
+
+def _bucket_ticks(days, bucket, start):
+    """``(xaxis ticks, hover labels)`` for bars at ``days`` (each bucket's first day).
+
+    Days get a daily tick. Weeks and months get a tick on each bar, since
+    Plotly's own week ticks fall on Sundays; a bucket that begins before
+    ``start`` (the first day charted) is labelled with ``start`` instead.
+    """
+    tickformat = _bucket_axes[bucket][1]
+    if bucket == "day":
+        return dict(tickformat=tickformat, dtick="D1"), None
+    labels = [f"{max(day, start):{tickformat}}" for day in days]
+    return dict(tickmode="array", tickvals=list(days), ticktext=labels), labels
+
+
+def daily_trend_figure(daily_counts, max_points=daily_point_budget, start=None):
+    """Bar chart of files per QA status day, or per week/month beyond ``max_points`` days.
+
+    ``start`` is the charted range's first day (default: the first day with files).
+    """
+    if start is None and not daily_counts.empty:
+        start = min(daily_counts[day_col])
+    daily_counts, bucket = bucket_daily_counts(daily_counts, max_points)
+    axis_title = _bucket_axes[bucket][0]
+    ticks, labels = _bucket_ticks(daily_counts[day_col], bucket, start)
+    fig_daily = px.bar(
+        daily_counts,
+        x=day_col,
+        y="File Count",
+        color="File Count",
+        color_continuous_scale="Blues",
+        text="File Count",
+        labels={day_col: axis_title, "File Count": "Number of Files"},
+        title=""
+    )
+
+    fig_daily.update_layout(
+        height=400,
+        xaxis=dict(
+            tickangle=-45,
+            tickfont=dict(size=10),
+            **ticks
+        ),
+        margin=dict(t=30, b=50, l=30, r=30),
+        showlegend=False,
+        coloraxis_showscale=False
+    )
+
+    fig_daily.update_traces(textposition='outside')
+    if labels is not None:
+        fig_daily.update_traces(
+            customdata=labels,
+            hovertemplate=f'{axis_title}: %{{customdata}}<br>Number of Files: %{{y}}<extra></extra>',
+        )
+    return fig_daily
+
+
+def daily_status_figure(pivot_daily, max_points=daily_point_budget, start=None):
+    """Grouped FTR/Iteration bars per QA status day (or week/month beyond ``max_points`` days) with the Average line.
+
+    ``start`` is the charted range's first day (default: the first day with files).
+    """
+    if start is None and not pivot_daily.empty:
+        start = min(pivot_daily.index)
+    pivot_daily, bucket = bucket_daily_status(pivot_daily, max_points)
+    axis_title = _bucket_axes[bucket][0]
+    ticks, labels = _bucket_ticks(pivot_daily.index, bucket, start)
+    x_hover = "%{x}" if labels is None else "%{customdata}"
+    fig_group = go.Figure()
+
+    # FTR bar
+    fig_group.add_trace(go.Bar(
+        x=pivot_daily.index,
+        y=pivot_daily[done_str],
+        name="FTR",
+        marker_color=DONE_COLOR,
+        text=pivot_daily[done_str],
+        textposition='outside',
+        customdata=labels,
+        hovertemplate=f'{axis_title}: {x_hover}<br>FTR: %{{y}}<extra></extra>'
+    ))
+
+    # Iteration Count bar
+    fig_group.add_trace(go.Bar(
+        x=pivot_daily.index,
+        y=pivot_daily[reject_str],
+        name="Iteration count",
+        marker_color=REJECTED_COLOR,
+        text=pivot_daily[reject_str],
+        textposition='outside',
+        customdata=labels,
+        hovertemplate=f'{axis_title}: {x_hover}<br>Iteration: %{{y}}<extra></extra>'
+    ))
+
+    # Average line
+    fig_group.add_trace(go.Scatter(
+        x=pivot_daily.index,
+        y=pivot_daily["Average"],
+        mode="lines+markers",
+        name="Average",
+        line=dict(color=AVG_COLOR, width=3, shape="spline"),
+        marker=dict(size=8, color="white", line=dict(width=2, color=AVG_COLOR)),
+        customdata=labels,
+        hovertemplate=f'{axis_title}: {x_hover}<br>Average: %{{y:.1f}}<extra></extra>'
+    ))
+
+    # Layout for combined chart
+    fig_group.update_layout(
+        barmode='group',
+        xaxis_title=axis_title,
+        yaxis_title="File Count",
+        plot_bgcolor=PLOT_BG,
+        paper_bgcolor=CARD_BG,
+        height=420,
+        xaxis=dict(
+            tickangle=-45,
+            tickfont=dict(size=10),
+            showgrid=True,
+            gridcolor='#f0f0f0',
+            **ticks
+        ),
+        yaxis=dict(
+            showgrid=True,
+            gridcolor='#f0f0f0'
+        ),
+        legend=dict(
+            orientation="v",
+            yanchor="top",
+            y=1,
+            xanchor="left",
+            x=1.02,
+            font=dict(color=DEEP_VIOLET),
+            bgcolor="rgba(255,255,255,0)"
+        ),
+        margin=dict(t=40, r=100, b=50, l=50),  # increased right margin to make space for donut
+        uniformtext_minsize=8,
+        uniformtext_mode='show'
+    )
+    return fig_group
+
+
+def frequency_figure(summary):
+    """Horizontal FTR% vs Iteration% bars per frequency."""
+    fig = go.Figure()
+
+    # ✅ FTR% Bar
+    fig.add_trace(go.Bar(
+        y=summary[frequency_col],
+        x=summary["FTR%"],
+        name="FTR %",
+        orientation='h',
+        marker_color="#28a745",
+        text=summary["FTR%"].astype(str) + "%",
+        textposition='outside'
+    ))
+
+    # ✅ Iteration% Bar
+    fig.add_trace(go.Bar(
+        y=summary[frequency_col],
+        x=summary["Iteration%"],
+        name="Iteration %",
+        orientation='h',
+        marker_color="#ff5733",
+        text=summary["Iteration%"].astype(str) + "%",
+        textposition='outside'
+    ))
+
+    # --- Chart layout styling ---
+    fig.update_layout(
+        barmode='group',
+        height=450,
+        plot_bgcolor='rgba(240,248,255,0.8)',
+        paper_bgcolor='rgba(255,255,255,0.8)',
+        xaxis_title="Percentage (%)",
+        yaxis_title="",
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=-0.25,
+            xanchor="center",
+            x=0.5
+        ),
+        margin=dict(l=40, r=20, t=40, b=40)
+    )
+    return fig
+
+
+def trend_figure(trend, group_col=None, metric="FTR %"):
+    """Month-by-month lines from :meth:`metrics.MonthlyAggregates.trends`.
+
+    Without ``group_col`` it draws the department's FTR % and Rework %;
+    with it, one ``metric`` line per QA or frequency.
+    """
+    if group_col is None:
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=trend["Month"], y=trend["FTR %"], name="FTR %", mode="lines+markers", line_color="#28a745"))
+        fig.add_trace(go.Scatter(x=trend["Month"], y=trend["Rework %"], name="Rework %", mode="lines+markers", line_color=REJECTED_COLOR))
+    else:
+        fig = px.line(trend, x="Month", y=metric, color=group_col, markers=True, hover_data=["Total"])
+
+    fig.update_layout(
+        height=420,
+        plot_bgcolor='rgba(240,248,255,0.8)',
+        paper_bgcolor='rgba(255,255,255,0.8)',
+        xaxis_title="",
+        yaxis_title="Percentage (%)",
+        xaxis=dict(type="category", tickangle=-45),
+        legend=dict(orientation="h", yanchor="bottom", y=-0.35, xanchor="center", x=0.5),
+        margin=dict(l=40, r=20, t=30, b=40)
+    )
+    return fig
+
+
+# --- Highcharts ---
+def status_donut_options(dept, kpis):
+    """Highcharts options for the 3D Done/Reject/Revised donut."""
+    return {
+        "chart": {
+            "type": "pie",
+            "backgroundColor": "#f8f9fc",
+            "options3d": {"enabled": True, "alpha": 45, "beta": 0},
+        },
+        "title": {"text": ""},
+        "tooltip": {"pointFormat": "{series.name}: <b>{point.y}</b>"},
+        "plotOptions": {
+            "pie": {
+                "allowPointSelect": True,
+                "cursor": "pointer",
+                "depth": 45,
+                "innerSize": 100,
+                "dataLabels": {"enabled": True, "format": "{point.name}: {point.y}"},
+            }
+        },
+        "series": [{
+            "name": "Files",
+            "data": [
+                {"name": "Done", "y": int(kpis["done"]), "color": "#28a745"},
+                {"name": "Reject", "y": int(kpis["reject"]), "color": "#dc3545"},
+                {"name": f"{dept} Done/Revised", "y": int(kpis["revised"]), "color": "#ffc107"},
+            ],
+        }],
+    }
+
+
+def qa_summary_options(qa_summary, others=None):
+    """Highcharts options for the stacked Done/Reject bars per QA.
+
+    ``others`` (from :func:`metrics.qa_page`) adds one greyed-out bar for
+    the QAs ranked below the ones shown.
+    """
+    categories = qa_summary["QA Name"].astype(str).tolist()
+    reject = qa_summary["Reject Count"].astype(int).tolist()
+    done = qa_summary["Done Count"].astype(int).tolist()
+    if others is not None:
+        categories.append(f"Others ({others['QAs']} QAs)")
+        reject.append({"y": others["Reject Count"], "color": OTHERS_REJECT_COLOR})
+        done.append({"y": others["Done Count"], "color": OTHERS_DONE_COLOR})
+    return {
+        "chart": {"type": "bar", "backgroundColor": "#f9f9fc"},
+        "title": {"text": "", "align": "left"},
+        "xAxis": {
+            "categories": categories,
+            "title": {"text": None},
+            "labels": {"style": {"fontSize": "13px"}},
+        },
+        "yAxis": {
+            "min": 0,
+            "title": {"text": "Count of Files", "align": "high"},
+            "labels": {"overflow": "justify"},
+        },
+        "tooltip": {"valueSuffix": " files"},
+        "plotOptions": {
+            "bar": {
+                "pointWidth": 20,
+                "groupPadding": 0.2,  # gap between groups of bars (like "Done" and "Reject")
+                "pointPadding": 0.1,
+                "dataLabels": {"enabled": True},
+            },
+            "series": {"stacking": "normal"},
+        },
+        "legend": {"enabled": False},
+        "credits": {"enabled": False},
+        "series": [
+            {"name": "Reject", "data": reject, "color": "#dc3545"},
+            {"name": "Done", "data": done, "color": "#28a745"},
+        ],
+    }
+
+
+def highcharts_local():
+    """Paths of the bundled Highcharts files, or ``None`` unless all of them are present."""
+    paths = [HIGHCHARTS_DIR / name for name in HIGHCHARTS_FILES]
+    return paths if all(path.is_file() for path in paths) else None
+
+
+def highcharts_sources(local_prefix):
+    """Script URLs for ``HIGHCHARTS_FILES``: the bundled copies under ``local_prefix`` if present, else the CDN.
+
+    Local URLs carry a ``?v=`` token from the files' size and mtime, so
+    browsers can keep them cached until the files are replaced.
+    """
+    paths = highcharts_local()
+    if paths is None:
+        return [f"{HIGHCHARTS_CDN}/{name}" for name in HIGHCHARTS_FILES]
+    sources = []
+    for name, path in zip(HIGHCHARTS_FILES, paths):
+        stat = path.stat()
+        sources.append(f"{local_prefix}/{name}?v={stat.st_size:x}{stat.st_mtime_ns:x}")
+    return sources
+
+
+def highcharts_chart(container_id, options, height):
+    """A container ``<div>`` and the script drawing ``options`` into it."""
+    return (
+        f'<div id="{container_id}" style="height: {height}px; width: 100%;"></div>\n'
+        f"<script>Highcharts.chart({json.dumps(container_id)}, {json.dumps(options)});</script>"
+    )
+
+
+# --- Tables ---
+def frequency_table(summary):
+    """The frequency summary as displayed: renamed columns plus a Total footer row."""
+    footer = pd.DataFrame({
+        "Frequency (Sheet Name)": ["Total"],
+        "Total File": [summary["Total File"].sum()],
+        "FTR %": [""],  # optional: leave blank
+        "Iteration %": [""],  # optional: leave blank
+        "Comment on Volume": [""]
+    })
+
+    summary_table = summary.rename(columns={
+        frequency_col: "Frequency (Sheet Name)",
+        "FTR%": "FTR %",
+        "Iteration%": "Iteration %",
+    })[["Frequency (Sheet Name)", "Total File", "FTR %", "Iteration %", "Comment on Volume"]]
+
+    return pd.concat([summary_table, footer], ignore_index=True)
@@ -0,0 +1,220 @@
+"""Export the dashboard as self-contained HTML for every department and month.
+
+The sheet is downloaded and parsed once and the count cube built once; a
+process pool then renders one report per department x month from that
+cube (each worker receives it once, at start-up) and writes
+``<out>/<DEPT>/<YYYY-MM>.html`` plus an ``index.html`` linking them all.
+
+    python export_reports.py --out reports
+    python export_reports.py --url sheet.csv --out reports --workers 4 --cdn
+"""
+import argparse
+import html
+import os
+import sys
+import urllib.error
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import plotly
+import plotly.offline
+
+from charts import (
+    HIGHCHARTS_CDN, HIGHCHARTS_FILES, highcharts_local,
+    daily_trend_figure, daily_status_figure, frequency_figure,
+    status_donut_options, qa_summary_options, highcharts_chart, frequency_table,
+)
+from metrics import build_cube, departments, available_months, month_report, qa_page
+from qa_data import SHEET_URLS, load_sheets, required_cols
+
+PAGE_CSS = """
+body { font-family: "Segoe UI", Arial, sans-serif; margin: 24px 40px; color: #333; }
+h1 { color: #4B0082; margin-bottom: 0; }
+.subtitle { color: #666; font-size: 17px; margin-top: 4px; }
+h3 { color: #290660; border-bottom: 1px solid #e0e0e0; padding-bottom: 4px; margin-top: 32px; }
+.kpis { display: flex; gap: 16px; }
+.kpi { flex: 1; background: #f9f9f9; border-radius: 15px; padding: 18px 20px; box-shadow: 0 4px 15px rgba(0,0,0,0.15); }
+.kpi h4 { margin: 0 0 8px; font-size: 17px; }
+.kpi .value { font-size: 30px; font-weight: 700; }
+.kpi .pct { font-size: 15px; opacity: 0.7; margin-left: 6px; }
+.total { border-left: 5px solid #4B0082; } .total .value { color: #4B0082; }
+.done { border-left: 5px solid #28a745; } .done .value { color: #28a745; }
+.reject { border-left: 5px solid #dc3545; } .reject .value { color: #dc3545; }
+.revised { border-left: 5px solid #ffcc00; } .revised .value { color: #ffcc00; }
+.row { display: flex; gap: 24px; align-items: flex-start; }
+.row > div { flex: 1; min-width: 0; }
+.notes { background: #e8f0fe; border-radius: 10px; padding: 12px 20px; }
+table { border-collapse: collapse; width: 100%; background: #f0f8ff; }
+th, td { border: 1px solid #999; padding: 6px 10px; text-align: left; }
+"""
+
+# Set once per worker by _init_worker.
+_cube = None
+_scripts = None
+
+
+def asset_scripts(cdn=False):
+    """``<script>`` tags for Plotly and Highcharts, embedded unless ``cdn``.
+
+    Highcharts is read from the bundled copies in static/highcharts/ (or
+    downloaded once here) and inlined into every report; if it cannot be
+    fetched the reports fall back to loading it from its CDN.
+    """
+    if cdn:
+        tags = [f'<script src="https://cdn.plot.ly/plotly-{plotly.__version__}.min.js"></script>']
+    else:
+        tags = [f"<script>{plotly.offline.get_plotlyjs()}</script>"]
+
+    local = None if cdn else highcharts_local()
+    if local is not None:
+        return "\n".join(tags + [f"<script>{path.read_text(encoding='utf-8')}</script>" for path in local])
+
+    for module in HIGHCHARTS_FILES:
+        src = f"{HIGHCHARTS_CDN}/{module}"
+        if not cdn:
+            try:
+                with urllib.request.urlopen(src, timeout=30) as response:
+                    tags.append(f"<script>{response.read().decode('utf-8')}</script>")
+                continue
+            except (urllib.error.URLError, OSError) as e:
+                print(f"Could not embed {src} ({e}); linking it instead", file=sys.stderr)
+        tags.append(f'<script src="{src}"></script>')
+    return "\n".join(tags)
+
+
+def _kpi_card(css_class, title, value, pct=None):
+    pct_html = f'<span class="pct">({pct:.1f}%)</span>' if pct is not None else ""
+    return f'<div class="kpi {css_class}"><h4>{html.escape(title)}</h4><div class="value">{value}{pct_html}</div></div>'
+
+
+def _figure_html(fig):
+    return fig.to_html(full_html=False, include_plotlyjs=False, config={"responsive": True})
+
+
+def render_report(report, scripts):
+    """One :func:`metrics.month_report` as a standalone HTML page; ``scripts`` from :func:`asset_scripts`."""
+    dept, month = report["department"], report["month"]
+    kpis, highlights = report["kpis"], report["highlights"]
+    pretty_month = datetime.strptime(month, "%Y-%m").strftime("%B - %Y")
+
+    qa_summary = report["qa_summary"]
+    if qa_summary.empty:
+        qa_chart = "<p>No individual QA activity found for this month.</p>"
+    else:
+        # The busiest QAs plus one bar for everyone else, like the page's first page.
+        top, others, _ = qa_page(qa_summary)
+        qa_chart = highcharts_chart("qa-summary", qa_summary_options(top, others), height=450)
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{dept} QA Dashboard - {pretty_month}</title>
+<style>{PAGE_CSS}</style>
+{scripts}
+</head>
+<body>
+<h1>📈 Monthly Quality Assurance Dashboard</h1>
+<div class="subtitle">A monthly overview of <strong>{dept}</strong> department activity for <strong>{pretty_month}</strong>.</div>
+
+<h3>📅 Monthly Overview</h3>
+<div class="kpis">
+{_kpi_card("total", f"📊 Total Files ({dept})", kpis["total"])}
+{_kpi_card("done", f"{dept} Done ✅", kpis["done"], kpis["done_pct"])}
+{_kpi_card("reject", "Rejected ❌", kpis["reject"], kpis["reject_pct"])}
+{_kpi_card("revised", "Done/Revised 📝", kpis["revised"], kpis["revised_pct"])}
+</div>
+
+<h3>📅 Daily {dept} Files Trend</h3>
+{_figure_html(daily_trend_figure(report["daily_counts"]))}
+<div class="notes"><ul>
+<li>Highest {dept} file count on <strong>{highlights["busiest_day"]}</strong></li>
+<li>Average per day: <strong>{highlights["average_per_day"]:.1f}</strong></li>
+</ul></div>
+
+<h3>🗓️ Daily {dept} Status Breakdown (Done vs Rejected)</h3>
+{_figure_html(daily_status_figure(report["daily_status"]))}
+<div class="notes"><ul>
+<li>Most FTR on: <strong>{highlights["most_done_day"]}</strong></li>
+<li>Most Rejections on: <strong>{highlights["most_rejected_day"]}</strong></li>
+<li>Rework Required: <strong>{highlights["rework_pct"]:.1f}%</strong></li>
+</ul></div>
+
+<div class="row">
+<div><h3>🎯 {dept} Status Distribution</h3>
+{highcharts_chart("status-donut", status_donut_options(dept, kpis), height=400)}</div>
+<div><h3>🧑‍💻 {dept}-wise Work Summary</h3>
+{qa_chart}</div>
+</div>
+
+<div class="row">
+<div><h3>📋 Frequency Summary Table</h3>
+{frequency_table(report["frequency_summary"]).to_html(index=False)}</div>
+<div><h3>📊 FTR% vs Iteration% by Frequency</h3>
+{_figure_html(frequency_figure(report["frequency_summary"]))}</div>
+</div>
+</body>
+</html>
+"""
+
+
+def _init_worker(cube, scripts):
+    global _cube, _scripts
+    _cube, _scripts = cube, scripts
+
+
+def _export_one(dept, month, path):
+    report = month_report(_cube, dept, month)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(render_report(report, _scripts), encoding="utf-8")
+    return path
+
+
+def write_index(out, paths, data_version):
+    links = "\n".join(
+        f'<li><a href="{path.relative_to(out).as_posix()}">{path.parent.name} {path.stem}</a></li>'
+        for path in paths
+    )
+    out.mkdir(parents=True, exist_ok=True)
+    index = out / "index.html"
+    index.write_text(
+        f'<!DOCTYPE html>\n<html lang="en"><head><meta charset="utf-8"><title>QA reports</title></head>\n'
+        f"<body><h1>Monthly QA reports</h1><p>Data version {data_version[:12]}</p>\n<ul>\n{links}\n</ul></body></html>\n",
+        encoding="utf-8",
+    )
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", nargs="+", default=SHEET_URLS, help="sheet CSV URLs or local paths, merged (default: QA_SHEET_URLS, QA_SHEET_URL or the published sheet)")
+    parser.add_argument("--out", default="reports", type=Path, help="output directory")
+    parser.add_argument("--departments", nargs="+", default=departments, metavar="DEPT")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--cdn", action="store_true", help="link Plotly/Highcharts from their CDNs instead of embedding them")
+    args = parser.parse_args(argv)
+
+    df, data_version = load_sheets(args.url)
+    missing = [col for col in required_cols if col not in df.columns]
+    if missing:
+        parser.error(f"required columns are missing in the data: {missing}")
+    cube = build_cube(df)
+    del df
+
+    jobs = [
+        (dept, month, args.out / dept / f"{month}.html")
+        for dept in (d.upper() for d in args.departments)
+        for month in available_months(cube, dept)
+    ]
+    scripts = asset_scripts(cdn=args.cdn)
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(cube, scripts)) as pool:
+        paths = list(pool.map(_export_one, *zip(*jobs))) if jobs else []
+
+    index = write_index(args.out, paths, data_version)
+    print(f"{len(paths)} reports written; open {index}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""Download the Highcharts files the dashboard serves locally into static/highcharts/.
+
+Run once on a machine with internet access (and commit or copy the folder
+for air-gapped deployments); without them the charts load from the CDN.
+
+    python fetch_assets.py
+"""
+import argparse
+import sys
+import urllib.request
+
+from charts import HIGHCHARTS_CDN, HIGHCHARTS_DIR, HIGHCHARTS_FILES
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base", default=HIGHCHARTS_CDN, help="where to download from, e.g. a pinned https://code.highcharts.com/<version>")
+    args = parser.parse_args(argv)
+
+    for name in HIGHCHARTS_FILES:
+        target = HIGHCHARTS_DIR / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with urllib.request.urlopen(f"{args.base}/{name}", timeout=60) as response:
+            data = response.read()
+        tmp = target.with_name(target.name + ".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(target)
+        print(f"{target} ({len(data) / 1024:.0f} KiB)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,562 @@
+"""Aggregate counts behind every number on the Monthly QA Dashboard.
+
+The page never needs individual rows, only how many files fall in each
+(department, month, QA-status day, QA, frequency, status) bucket. That
+cube is built once per data version and every card, table and chart is a
+small reduction over its slice for the selected department and month.
+
+Months are integer codes (``year * 12 + month - 1``) inside the cube,
+which is kept sorted by department and month; an offset table gives each
+department's months and their row ranges, so a month's slice is found by
+binary search and taken without copying. ``YYYY-MM`` labels are only used
+at the edges (:func:`available_months`, :func:`month_report`).
+
+Nothing here imports Streamlit: :func:`month_report` gives everything one
+page render needs, and ``precompute.py`` writes it for every department and
+month as JSON.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import namedtuple
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from qa_data import date_col, status_col, qa_col, dept_col, qa_status_date_col, frequency_col
+
+day_col = "QA Status Date Only"
+status_month_col = "QA Status Month"
+count_col = "Count"
+
+cube_keys = [dept_col, "Month", status_month_col, day_col, qa_col, frequency_col, status_col]
+
+departments = ["QC", "QA"]
+
+done_str = "qa done"
+reject_str = "qa rejected"
+revised_str = "qa done/revised"
+
+
+# ``counts`` is the cube frame; ``offsets`` maps each department to
+# ``(month_codes, bounds)``: its sorted month codes, and row bounds so that
+# month ``month_codes[i]`` is ``counts.iloc[bounds[i]:bounds[i + 1]]``.
+Cube = namedtuple("Cube", ["counts", "offsets"])
+
+
+def month_code(label):
+    """``"YYYY-MM"`` as the integer month code used in the cube."""
+    year, month = label.split("-")
+    return int(year) * 12 + int(month) - 1
+
+
+def month_label(code):
+    """The ``"YYYY-MM"`` label of an integer month code."""
+    return f"{code // 12:04d}-{code % 12 + 1:02d}"
+
+
+def _month_codes(dates):
+    return (dates.dt.year * 12 + dates.dt.month - 1).to_numpy()
+
+
+def _month_offsets(counts):
+    """The :class:`Cube` offset table of ``counts`` sorted by department and month."""
+    depts = counts[dept_col].cat.codes.to_numpy()
+    months = counts["Month"].to_numpy()
+    starts = np.flatnonzero(np.diff(depts, prepend=-2) | np.diff(months, prepend=-1))
+    bounds = np.append(starts, len(counts))
+    offsets = {}
+    for code, dept in enumerate(counts[dept_col].cat.categories):
+        runs = np.flatnonzero(depts[starts] == code)
+        if len(runs):
+            offsets[dept] = (months[starts[runs]], np.append(bounds[runs], bounds[runs[-1] + 1]))
+    return offsets
+
+
+def build_cube(df):
+    """Count the sheet's rows per ``cube_keys`` bucket, as a :class:`Cube`.
+
+    Expects a frame from :func:`qa_data.load_sheet`, whose department,
+    status and frequency are already normalised categoricals; rows without
+    either date are dropped. ``Month`` is the month the file came for QA;
+    the ``QA Status Month``/``QA Status Date Only`` keys come from the QA
+    status date and drive the daily charts. Both months are integer codes.
+    """
+    come = df[date_col]
+    qa_date = df[qa_status_date_col]
+    keep = (come.notna() & qa_date.notna()).to_numpy()
+    if frequency_col in df.columns:
+        frequency = df[frequency_col]
+    else:
+        frequency = pd.Series(pd.Categorical(["nan"] * len(df)), index=df.index)
+
+    rows = pd.DataFrame({
+        dept_col: df[dept_col],
+        "Month": _month_codes(come),
+        status_month_col: _month_codes(qa_date),
+        day_col: qa_date.dt.normalize(),
+        qa_col: df[qa_col],
+        frequency_col: frequency,
+        status_col: df[status_col],
+    })[keep].astype({"Month": np.int32, status_month_col: np.int32})
+
+    # Grouping sorts by the keys, so the counts come out ordered by department and month.
+    counts = rows.groupby(cube_keys, dropna=False, observed=True).size().rename(count_col).reset_index()
+    counts[day_col] = counts[day_col].dt.date
+    return Cube(counts, _month_offsets(counts))
+
+
+def month_slice(cube, dept, month):
+    """Cube rows for one department (``"QC"``/``"QA"``) and ``YYYY-MM`` month (a view, not a copy)."""
+    month_codes, bounds = cube.offsets.get(dept.upper(), (np.empty(0, np.int32), np.zeros(1, np.int64)))
+    code = month_code(month)
+    i = np.searchsorted(month_codes, code)
+    if i == len(month_codes) or month_codes[i] != code:
+        return cube.counts.iloc[:0]
+    return cube.counts.iloc[bounds[i]:bounds[i + 1]]
+
+
+# --- Reductions over one month ---
+def status_crosstab(counts):
+    """One pass over a month's counts: status columns by (status month, day, QA, frequency).
+
+    Every compute_* function below is a sum over this table's index levels,
+    so the slice is grouped exactly once per render.
+    """
+    return (
+        counts
+        .groupby([status_month_col, day_col, qa_col, frequency_col, status_col], dropna=False, observed=True)[count_col]
+        .sum()
+        .unstack(status_col, fill_value=0)
+    )
+
+
+def _statuses(table, statuses):
+    """``table`` restricted to ``statuses`` columns, adding any that are missing as zeros."""
+    return table.reindex(columns=statuses, fill_value=0)
+
+
+def compute_kpis(table):
+    """Total and per-status file counts plus their share of the total (in %)."""
+    # A table with no status columns (an empty range) sums to float otherwise.
+    totals = table.sum().astype("int64")
+    total = totals.sum()
+    done = totals.get(done_str, 0)
+    revised = totals.get(revised_str, 0)
+    reject = totals.get(reject_str, 0)
+    return {
+        "total": total,
+        "done": done,
+        "revised": revised,
+        "reject": reject,
+        "done_pct": (done / total * 100) if total else 0,
+        "revised_pct": (revised / total * 100) if total else 0,
+        "reject_pct": (reject / total * 100) if total else 0,
+    }
+
+
+def compute_qa_summary(table):
+    """Done/Reject/Revised counts, Total and rejection rate per QA, ascending by Total."""
+    per_qa = _statuses(table.groupby(level=qa_col, observed=True).sum(), [done_str, reject_str, revised_str])
+    per_qa = per_qa[(per_qa > 0).any(axis=1)]
+    qa_summary = per_qa.set_axis(["Done Count", "Reject Count", "Revised Count"], axis=1).reset_index()
+
+    qa_summary['Total'] = qa_summary['Done Count'] + qa_summary['Reject Count'] + qa_summary['Revised Count']
+    qa_summary['Rejection Rate (%)'] = np.where(
+        qa_summary['Total'] > 0,
+        (qa_summary['Reject Count'] / qa_summary['Total']) * 100,
+        0.0
+    ).round(1)
+    return qa_summary.sort_values(by='Total', ascending=True)
+
+
+# Columns the QA-wise chart can be ranked by, and how many QAs it shows at once.
+qa_rank_cols = ["Total", "Reject Count", "Rejection Rate (%)"]
+qa_page_size = 15
+
+
+def qa_page(qa_summary, rank_by="Total", page=0, page_size=qa_page_size):
+    """One page of ``qa_summary`` ranked by ``rank_by`` (highest first), plus an "others" bucket.
+
+    Returns ``(rows, others, pages)``: the page's QAs, the summed counts of
+    every QA ranked below the page as a dict with a ``"QAs"`` count (``None``
+    when there are none) and the number of pages. Whatever the team size,
+    the chart gets at most ``page_size + 1`` bars.
+    """
+    ranked = qa_summary.sort_values([rank_by, "Total"], ascending=False, kind="stable")
+    pages = max(1, -(-len(ranked) // page_size))
+    page = min(max(page, 0), pages - 1)
+    rows = ranked.iloc[page * page_size:(page + 1) * page_size]
+    rest = ranked.iloc[(page + 1) * page_size:]
+    if rest.empty:
+        return rows, None, pages
+    done, reject, revised = (int(rest[col].sum()) for col in ["Done Count", "Reject Count", "Revised Count"])
+    total = done + reject + revised
+    others = {
+        "QAs": len(rest),
+        "Done Count": done,
+        "Reject Count": reject,
+        "Revised Count": revised,
+        "Total": total,
+        "Rejection Rate (%)": round(reject / total * 100, 1) if total else 0.0,
+    }
+    return rows, others, pages
+
+
+def _days_in(table, month):
+    """Rows of ``table`` whose QA status date falls in ``month``."""
+    in_month = table.index.get_level_values(status_month_col) == month_code(month)
+    return table[in_month]
+
+
+def compute_daily_counts(table, month):
+    """Files per QA status day within ``month``."""
+    return (
+        _days_in(table, month)
+        .sum(axis=1)
+        .groupby(level=day_col, observed=True)
+        .sum()
+        .reset_index(name='File Count')
+    )
+
+
+def compute_daily_status(table, month):
+    """Done and rejected files per QA status day within ``month``, with their daily average."""
+    done_reject = _statuses(_days_in(table, month), [done_str, reject_str])
+    pivot_daily = done_reject.groupby(level=day_col, observed=True).sum()
+    pivot_daily = pivot_daily[(pivot_daily > 0).any(axis=1)]
+    pivot_daily["Average"] = pivot_daily.mean(axis=1)
+    return pivot_daily
+
+
+# --- Time buckets for the daily charts ---
+# Most bars a daily chart draws; longer ranges are re-bucketed by week, then
+# by month. QA_DAILY_POINTS overrides it.
+daily_point_budget = int(os.environ.get("QA_DAILY_POINTS", 62))
+
+
+def time_bucket(days, max_points=daily_point_budget):
+    """``"day"``, ``"week"`` or ``"month"``: the finest bucket that keeps the span of ``days`` within ``max_points``."""
+    if len(days) == 0:
+        return "day"
+    span = (max(days) - min(days)).days + 1
+    if span <= max_points:
+        return "day"
+    if -(-span // 7) <= max_points:
+        return "week"
+    return "month"
+
+
+def _bucket_starts(days, bucket):
+    """First day of the week (Monday) or month holding each of ``days``."""
+    days = pd.to_datetime(pd.Series(days))
+    if bucket == "week":
+        days = days - pd.to_timedelta(days.dt.weekday, unit="D")
+    else:
+        days = days.dt.to_period("M").dt.start_time
+    return days.dt.date.to_numpy()
+
+
+def bucket_daily_counts(daily_counts, max_points=daily_point_budget):
+    """``(counts, bucket)``: :func:`compute_daily_counts` output summed per :func:`time_bucket`.
+
+    The day column then holds each bucket's first day.
+    """
+    bucket = time_bucket(daily_counts[day_col], max_points)
+    if bucket == "day":
+        return daily_counts, bucket
+    starts = _bucket_starts(daily_counts[day_col], bucket)
+    counts = daily_counts.groupby(starts)["File Count"].sum().rename_axis(day_col).reset_index()
+    return counts, bucket
+
+
+def bucket_daily_status(pivot_daily, max_points=daily_point_budget):
+    """``(pivot, bucket)``: :func:`compute_daily_status` output summed per :func:`time_bucket`, with its Average redone."""
+    bucket = time_bucket(pivot_daily.index, max_points)
+    if bucket == "day":
+        return pivot_daily, bucket
+    starts = _bucket_starts(pivot_daily.index, bucket)
+    pivot = pivot_daily[[done_str, reject_str]].groupby(starts).sum().rename_axis(day_col)
+    pivot["Average"] = pivot.mean(axis=1)
+    return pivot, bucket
+
+
+def volume_comment(x):
+    if x > 100:
+        return "🔵 High volume"
+    elif x > 50:
+        return "🟢 Medium volume"
+    else:
+        return "🟠 Low volume"
+
+
+def compute_frequency_summary(table):
+    """Per-frequency status counts with Total File, FTR%, Iteration% and a volume comment."""
+    summary = table.groupby(level=frequency_col, observed=True).sum().reset_index()
+    summary.columns.name = None
+
+    for col in [done_str, reject_str]:
+        if col not in summary.columns:
+            summary[col] = 0
+
+    summary["Total File"] = summary[[done_str, reject_str]].sum(axis=1)
+    total_file = summary["Total File"].where(summary["Total File"] > 0)
+    summary["FTR%"] = (summary[done_str] / total_file * 100).fillna(0).round(0).astype(int)
+    summary["Iteration%"] = (summary[reject_str] / total_file * 100).fillna(0).round(0).astype(int)
+    summary["Comment on Volume"] = summary["Total File"].apply(volume_comment)
+    return summary
+
+
+# --- Whole-page reports ---
+def available_months(cube, dept):
+    """``YYYY-MM`` months with at least one file for ``dept``, oldest first."""
+    month_codes = cube.offsets.get(dept.upper(), (np.empty(0, np.int32), None))[0]
+    return [month_label(code) for code in month_codes]
+
+
+def month_report(cube, dept, month):
+    """Every number the page shows for ``dept`` in ``month``, from one crosstab of the cube slice."""
+    return slice_report(month_slice(cube, dept, month), dept, month)
+
+
+def slice_report(counts, dept, month):
+    """:func:`month_report` for counts already narrowed to ``dept`` and ``month``
+    (a cube slice, or the same columns aggregated by ``qa_store``)."""
+    table = status_crosstab(counts)
+    kpis = compute_kpis(table)
+    daily_counts = compute_daily_counts(table, month)
+    daily_status = compute_daily_status(table, month)
+
+    highlights = {
+        "busiest_day": daily_counts.loc[daily_counts["File Count"].idxmax(), day_col] if not daily_counts.empty else "N/A",
+        "average_per_day": daily_counts["File Count"].mean() if not daily_counts.empty else 0.0,
+        "most_done_day": daily_status[done_str].idxmax() if not daily_status.empty else "N/A",
+        "most_rejected_day": daily_status[reject_str].idxmax() if not daily_status.empty else "N/A",
+        "rework_pct": kpis["reject_pct"] + kpis["revised_pct"],
+    }
+    return {
+        "department": dept,
+        "month": month,
+        "kpis": kpis,
+        "highlights": highlights,
+        "qa_summary": compute_qa_summary(table),
+        "daily_counts": daily_counts,
+        "daily_status": daily_status,
+        "frequency_summary": compute_frequency_summary(table),
+    }
+
+
+# --- Multi-month trends ---
+trend_cols = ["Total", "FTR %", "Rework %"]
+
+
+def _with_rates(totals):
+    """``totals`` (status columns) reduced to Total, FTR % and Rework %, as on the KPI cards."""
+    totals = _statuses(totals, [done_str, reject_str, revised_str]).assign(Total=totals.sum(axis=1))
+    total = totals["Total"].where(totals["Total"] > 0)
+    totals["FTR %"] = (totals[done_str] / total * 100).fillna(0).round(1)
+    totals["Rework %"] = ((totals[reject_str] + totals[revised_str]) / total * 100).fillna(0).round(1)
+    return totals[trend_cols].rename_axis(columns=None)
+
+
+def _month_aggregate(counts):
+    """One month's status totals per QA and per frequency (the trend building blocks)."""
+    return {
+        "qa": counts.groupby([qa_col, status_col], dropna=False, observed=True)[count_col].sum().unstack(status_col, fill_value=0),
+        "frequency": counts.groupby([frequency_col, status_col], dropna=False, observed=True)[count_col].sum().unstack(status_col, fill_value=0),
+    }
+
+
+def cube_months(cube):
+    """``(dept, month_code, counts)`` for every month slice of the cube."""
+    for dept, (month_codes, bounds) in cube.offsets.items():
+        for i, code in enumerate(month_codes):
+            yield dept, int(code), cube.counts.iloc[bounds[i]:bounds[i + 1]]
+
+
+def _fingerprint(counts):
+    return hashlib.sha1(pd.util.hash_pandas_object(counts, index=False).to_numpy().tobytes()).hexdigest()
+
+
+class MonthlyAggregates:
+    """Per (department, month) status totals, kept across data versions for the trend view.
+
+    :meth:`update` hashes each month's cube slice and only regroups the
+    months whose counts changed (normally the current one), so a new sheet
+    version costs one hash pass over the cube plus the changed months,
+    not a regrouping of the whole history.
+    """
+
+    def __init__(self):
+        self.data_version = None
+        self.recomputed = 0
+        self._months = {}
+        self._lock = threading.Lock()
+
+    def update(self, slices, data_version):
+        """Bring the aggregates up to ``slices`` (from :func:`cube_months`); returns how many months were regrouped."""
+        with self._lock:
+            return self._update(slices, data_version)
+
+    def _update(self, slices, data_version):
+        if data_version == self.data_version:
+            return 0
+        months, recomputed = {}, 0
+        for dept, code, counts in slices:
+            key, fingerprint = (dept, code), _fingerprint(counts)
+            previous = self._months.get(key)
+            if previous is not None and previous[0] == fingerprint:
+                months[key] = previous
+            else:
+                months[key] = (fingerprint, _month_aggregate(counts))
+                recomputed += 1
+        self._months, self.data_version, self.recomputed = months, data_version, recomputed
+        return recomputed
+
+    def trends(self, dept, slices, data_version):
+        """FTR % and Rework % per month for ``dept`` overall, per QA and per frequency, as of ``data_version``.
+
+        The aggregates are brought up to ``slices`` and read under one lock,
+        so a session still on another data version cannot swap them in
+        between. Returns ``{"department": frame, "qa": frame, "frequency": frame}``;
+        every frame has a ``Month`` (``YYYY-MM``) column plus :data:`trend_cols`,
+        and the QA/frequency frames also the QA name or frequency.
+        """
+        with self._lock:
+            self._update(slices, data_version)
+            installed = self._months
+        months = sorted((code, aggregate) for (d, code), (_, aggregate) in installed.items() if d == dept.upper())
+        labels = [month_label(code) for code, _ in months]
+        if not months:
+            empty = pd.DataFrame(columns=["Month"] + trend_cols)
+            return {"department": empty, "qa": empty.assign(**{qa_col: []}), "frequency": empty.assign(**{frequency_col: []})}
+
+        def stacked(part, key_col):
+            frames = [aggregate[part] for _, aggregate in months]
+            return pd.concat(frames, keys=labels, names=["Month", key_col]).fillna(0)
+
+        per_qa = stacked("qa", qa_col)
+        department = _with_rates(per_qa.groupby(level="Month").sum()).reset_index()
+        by_qa = _with_rates(per_qa)
+        by_qa = by_qa[by_qa["Total"] > 0].reset_index().dropna(subset=[qa_col])
+        by_frequency = _with_rates(stacked("frequency", frequency_col))
+        by_frequency = by_frequency[by_frequency["Total"] > 0].reset_index()
+        return {"department": department, "qa": by_qa, "frequency": by_frequency}
+
+
+# --- Arbitrary date ranges ---
+# Per department: running totals of files per (QA status day, QA, status).
+# ``cumulative[i]`` holds the counts of every day before ``first_day + i``,
+# so any inclusive range of days is the difference of two rows;
+# ``cumulative_files[i]`` is the same running total summed over QAs and statuses.
+DailyTotals = namedtuple("DailyTotals", ["first_day", "last_day", "qas", "statuses", "cumulative", "cumulative_files"])
+
+
+def build_daily_totals(cube):
+    """``{dept: DailyTotals}`` from the cube; built once per data version."""
+    counts = cube.counts
+    days = pd.to_datetime(counts[day_col]).to_numpy().astype("datetime64[D]")
+    totals = {}
+    for dept, (_, bounds) in cube.offsets.items():
+        rows = slice(bounds[0], bounds[-1])
+        dept_days = days[rows]
+        first_day, last_day = dept_days.min(), dept_days.max()
+        qa_codes, qas = pd.factorize(counts[qa_col].iloc[rows].astype(object), sort=True, use_na_sentinel=False)
+        status_codes, statuses = pd.factorize(counts[status_col].iloc[rows].astype(object), sort=True, use_na_sentinel=False)
+        grid = np.zeros(((last_day - first_day).astype(int) + 2, len(qas), len(statuses)), dtype=np.int64)
+        np.add.at(grid, ((dept_days - first_day).astype(int) + 1, qa_codes, status_codes), counts[count_col].to_numpy()[rows])
+        totals[dept] = DailyTotals(
+            first_day.item(), last_day.item(), qas, statuses, grid.cumsum(axis=0), grid.sum(axis=(1, 2)).cumsum(),
+        )
+    return totals
+
+
+range_presets = ["Last 7 days", "Last 30 days", "Last 90 days", "This quarter"]
+
+
+def preset_range(preset, last_day):
+    """``(start, end)`` days of a :data:`range_presets` entry, ending on ``last_day``."""
+    if preset == "This quarter":
+        return last_day.replace(month=(last_day.month - 1) // 3 * 3 + 1, day=1), last_day
+    days = int(preset.split()[1])
+    return last_day - timedelta(days=days - 1), last_day
+
+
+def previous_range(start, end):
+    """The range of the same length just before ``start``..``end`` (for week-over-week style deltas)."""
+    length = end - start + timedelta(days=1)
+    return start - length, start - timedelta(days=1)
+
+
+def _day_index(totals, day):
+    """Row of ``totals.cumulative`` before ``day``, clamped to the stored days."""
+    offset = (np.datetime64(day, "D") - np.datetime64(totals.first_day, "D")).astype(int)
+    return int(np.clip(offset, 0, len(totals.cumulative) - 1))
+
+
+def range_report(daily_totals, dept, start, end):
+    """KPIs, QA-wise summary and daily counts for ``dept`` over QA status days ``start``..``end`` (inclusive).
+
+    Each number is a difference of two rows of the running totals, so the
+    cost does not depend on how much history the range covers.
+    """
+    totals = daily_totals.get(dept.upper())
+    if totals is None:
+        table = pd.DataFrame(index=pd.Index([], name=qa_col), columns=pd.Index([], name=status_col), dtype="int64")
+        return range_summary(table, pd.DataFrame({day_col: [], "File Count": []}), dept, start, end)
+    lo, hi = _day_index(totals, start), _day_index(totals, end + timedelta(days=1))
+    table = pd.DataFrame(
+        totals.cumulative[hi] - totals.cumulative[lo],
+        index=pd.Index(totals.qas, name=qa_col),
+        columns=pd.Index(totals.statuses, name=status_col),
+    )
+    per_day = np.diff(totals.cumulative_files[lo:hi + 1])
+    daily_counts = pd.DataFrame({
+        day_col: [totals.first_day + timedelta(days=day) for day in range(lo, hi)],
+        "File Count": per_day,
+    })
+    return range_summary(table, daily_counts[daily_counts["File Count"] > 0].reset_index(drop=True), dept, start, end)
+
+
+def range_summary(table, daily_counts, dept, start, end):
+    """The date-range report from a QA x status ``table`` and the range's ``daily_counts``
+    (shared by :func:`range_report` and ``qa_store``)."""
+    kpis = compute_kpis(table)
+    return {
+        "department": dept,
+        "start": start,
+        "end": end,
+        "kpis": kpis,
+        "rework_pct": kpis["reject_pct"] + kpis["revised_pct"],
+        "qa_summary": compute_qa_summary(table),
+        "daily_counts": daily_counts,
+    }
+
+
+def _jsonable(value):
+    if isinstance(value, pd.DataFrame):
+        frame = value.reset_index() if value.index.name else value
+        frame = frame.astype({col: str for col in frame.columns if col == day_col})
+        return json.loads(frame.to_json(orient="records"))
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if isinstance(value, np.generic):
+        return value.item()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def report_to_json(report):
+    """``report`` (from :func:`month_report`) as plain JSON-serialisable Python."""
+    return _jsonable(report)
+
+
+def precompute_reports(cube, depts=None):
+    """``{dept: {month: report}}`` for every department and month in the cube."""
+    return {
+        dept: {month: month_report(cube, dept, month) for month in available_months(cube, dept)}
+        for dept in (depts or departments)
+    }
@@ -0,0 +1,50 @@
+"""Precompute the dashboard's numbers for every department and month as JSON.
+
+Runs without Streamlit, on the same data layer and metrics as the page:
+
+    python precompute.py --out reports.json
+    python precompute.py --url sheet.csv --departments QC
+"""
+import argparse
+import json
+import sys
+from datetime import datetime, timezone
+
+from metrics import build_cube, departments, precompute_reports, report_to_json
+from qa_data import SHEET_URLS, load_sheets, required_cols
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", nargs="+", default=SHEET_URLS, help="sheet CSV URLs or local paths, merged (default: QA_SHEET_URLS, QA_SHEET_URL or the published sheet)")
+    parser.add_argument("--out", default="-", help="output JSON file, '-' for stdout")
+    parser.add_argument("--departments", nargs="+", default=departments, metavar="DEPT")
+    args = parser.parse_args(argv)
+
+    df, data_version = load_sheets(args.url)
+    missing = [col for col in required_cols if col not in df.columns]
+    if missing:
+        parser.error(f"required columns are missing in the data: {missing}")
+
+    reports = precompute_reports(build_cube(df), [dept.upper() for dept in args.departments])
+    document = {
+        "data_version": data_version,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "reports": {
+            dept: {month: report_to_json(report) for month, report in by_month.items()}
+            for dept, by_month in reports.items()
+        },
+    }
+
+    if args.out == "-":
+        json.dump(document, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(document, fh, ensure_ascii=False, indent=2)
+        n = sum(len(by_month) for by_month in reports.values())
+        print(f"{n} department-month reports written to {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
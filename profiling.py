@@ -0,0 +1,108 @@
+"""Opt-in timing and memory breakdown of one dashboard run (open the page with ``?profile=1``).
+
+The page calls :meth:`Profiler.lap` at the start of each section and
+:meth:`Profiler.stop` at the end; cached loaders are called through
+:meth:`Profiler.cached` and report their misses with :func:`count_miss`
+from inside the cached body, which Streamlit only runs on a miss.
+
+A disabled profiler returns from every method straight away and never
+starts ``tracemalloc``, so the page pays one attribute check per call.
+Sections are sequential, not nested; memory is what Python (and numpy/
+pandas) allocated while the section ran, as seen by ``tracemalloc``. A
+``lap`` after ``stop`` starts a new run, which is how a fragment rerun
+(that skips the top of the page) gets its own breakdown.
+"""
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+import pandas as pd
+
+_local = threading.local()
+
+
+def count_miss(name):
+    """Record a cache miss for ``name``; call it first thing in a cached function's body."""
+    misses = getattr(_local, "misses", None)
+    if misses is not None:
+        misses[name] += 1
+
+
+class Profiler:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._owns_tracing = False
+        # Script runs reuse threads, so always reset what a previous run left behind.
+        _local.misses = None
+        self._start_run()
+
+    def _start_run(self):
+        self.sections = []
+        self.caches = {}
+        self._open = None
+        self._stopped = False
+        if not self.enabled:
+            return
+        _local.misses = Counter()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+
+    def lap(self, name):
+        """End the running section (if any) and start timing ``name``."""
+        if not self.enabled:
+            return
+        if self._stopped:
+            self._start_run()
+        self._close()
+        tracemalloc.reset_peak()
+        self._open = (name, time.perf_counter(), tracemalloc.get_traced_memory()[0])
+
+    def stop(self):
+        """End the running section and stop ``tracemalloc`` if this profiler started it."""
+        if not self.enabled:
+            return
+        self._close()
+        self._stopped = True
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    def _close(self):
+        if self._open is None:
+            return
+        name, start, before = self._open
+        elapsed = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+        self.sections.append({
+            "Section": name,
+            "Time (ms)": elapsed * 1000,
+            "Net allocated (MB)": (current - before) / 1e6,
+            "Peak (MB)": max(peak - before, 0) / 1e6,
+        })
+        self._open = None
+
+    def cached(self, name, fn, *args, **kwargs):
+        """``fn(*args, **kwargs)`` for a Streamlit-cached ``fn``, counting it as a hit or a miss."""
+        if not self.enabled:
+            return fn(*args, **kwargs)
+        misses_before = _local.misses[name]
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        stats = self.caches.setdefault(name, {"Cache": name, "Calls": 0, "Hits": 0, "Misses": 0, "Time (ms)": 0.0})
+        missed = _local.misses[name] > misses_before
+        stats["Calls"] += 1
+        stats["Misses" if missed else "Hits"] += 1
+        stats["Time (ms)"] += elapsed * 1000
+        return result
+
+    def sections_frame(self):
+        frame = pd.DataFrame(self.sections, columns=["Section", "Time (ms)", "Net allocated (MB)", "Peak (MB)"])
+        total = frame["Time (ms)"].sum()
+        frame["Share (%)"] = (frame["Time (ms)"] / total * 100) if total else 0.0
+        return frame.round(2)
+
+    def caches_frame(self):
+        return pd.DataFrame(list(self.caches.values()), columns=["Cache", "Calls", "Hits", "Misses", "Time (ms)"]).round(2)
@@ -0,0 +1,41 @@
+"""Streamlit component drawing the status donut and the QA-wise bars in one iframe.
+
+The component's page (``frontend/qa_charts/index.html``) is static; each
+rerun only sends it the two charts' Highcharts options. Under a fixed
+``key`` the iframe and both chart instances survive month and department
+changes, and new counts are applied in place with ``setData``. Highcharts itself
+comes from ``static/highcharts/`` through Streamlit's static file serving
+(``server.enableStaticServing``), falling back to the CDN when the files
+have not been fetched.
+"""
+from pathlib import Path
+
+import streamlit.components.v1 as components
+
+from charts import highcharts_sources, qa_summary_options, status_donut_options
+
+_component = components.declare_component(
+    "qa_charts", path=str(Path(__file__).resolve().parent / "frontend" / "qa_charts")
+)
+
+# The component page is served from <app>/component/qa_charts.qa_charts/index.html.
+LOCAL_PREFIX = "../../app/static/highcharts"
+
+
+def qa_charts(dept, kpis, qa_summary, others=None, height=450, key="qa_charts"):
+    """Draw the month's status donut and (unless ``qa_summary`` is empty) QA-wise bar chart.
+
+    ``qa_summary`` is the page of QAs to draw and ``others`` the bucket for
+    the rest (see :func:`metrics.qa_page`); only those reach the browser.
+
+    Returns the last clicked QA bar as ``{"qa": name, "status": "Done"|"Reject"}``,
+    or ``None`` before any click.
+    """
+    return _component(
+        sources=highcharts_sources(LOCAL_PREFIX),
+        donut=status_donut_options(dept, kpis),
+        qa=None if qa_summary.empty else qa_summary_options(qa_summary, others),
+        height=height,
+        key=key,
+        default=None,
+    )
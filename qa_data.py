@@ -0,0 +1,689 @@
+"""Headless data layer for the Monthly QA Dashboard.
+
+Holds the sheet column names and the local columnar snapshot of the
+published Google Sheet, so the Streamlit page (``webpage.py``) only deals
+with presentation.
+"""
+import csv
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+import urllib.parse
+import warnings
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import requests
+from pandas.api.types import union_categoricals
+from pyarrow import csv as pa_csv
+from pyarrow import feather
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.2
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
+# --- Sheet columns ---
+project_col = "Project Name as per the SOW"
+date_col = "File come for QA Date"
+status_col = "QA Status"
+feed_site_col = "Feed(Site) Name"
+qa_col = "QA Name"
+dept_col = "Department"
+qa_status_date_col = "QA status - Date"
+frequency_col = "Frequency"
+
+required_cols = [project_col, date_col, status_col, feed_site_col, qa_col, dept_col, qa_status_date_col]
+date_cols = [date_col, qa_status_date_col]
+# Which published tab a row came from, when several are merged.
+source_col = "Source"
+
+# Everything the dashboard reads; the fast ingestion path drops the rest.
+used_cols = required_cols + [frequency_col]
+# Low-cardinality text columns, normalised once at load and kept as categoricals.
+categorical_cols = [status_col, qa_col, dept_col, frequency_col, feed_site_col, project_col]
+
+# The published QA sheet; QA_SHEET_URL points the page and the CLI elsewhere.
+SHEET_URL = os.environ.get(
+    "QA_SHEET_URL",
+    "https://docs.google.com/spreadsheets/d/e/2PACX-1vQfmDvoHtr58LTd1MhYyI2s3uJqt6YbXklFt6JZ2pm6aQtriz1vz4kwGtHoY1-a9EH0M4cMnD74gk7O/pub?gid=2104660007&single=true&output=csv",
+)
+# Several published tabs (one per team/year) can be merged: QA_SHEET_URLS
+# lists them, separated by commas or whitespace.
+SHEET_URLS = os.environ.get("QA_SHEET_URLS", "").replace(",", " ").split() or [SHEET_URL]
+SNAPSHOT_DIR = Path(__file__).resolve().parent / ".snapshots"
+
+
+# --- Raw sheet access ---
+HTTP_TIMEOUT = 60
+_session = None
+_session_lock = threading.Lock()
+
+
+def _http_session():
+    """One ``requests.Session`` per process, so refreshes and concurrent tab
+    downloads reuse pooled (keep-alive) connections to the sheet host."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+    return _session
+
+
+def fetch_source(url, etag=None, last_modified=None):
+    """Fetch the raw CSV bytes of ``url`` (an http(s) URL or a local path).
+
+    ``etag``/``last_modified`` are the validators remembered from the
+    previous response; when the source reports it is unchanged (HTTP 304,
+    or same mtime and size for a local file) the returned bytes are
+    ``None``. Returns ``(raw, validators)``.
+    """
+    if url.startswith(("http://", "https://")):
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        resp = _http_session().get(url, headers=headers, timeout=HTTP_TIMEOUT)
+        if resp.status_code == 304:
+            return None, {"etag": etag, "last_modified": last_modified}
+        resp.raise_for_status()
+        return resp.content, {"etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified")}
+
+    stat = os.stat(url)
+    validator = f"{stat.st_mtime_ns}-{stat.st_size}"
+    if etag == validator:
+        return None, {"etag": etag, "last_modified": None}
+    with open(url, "rb") as fh:
+        return fh.read(), {"etag": validator, "last_modified": None}
+
+
+def read_source_bytes(url):
+    """Return the raw CSV bytes of ``url`` unconditionally."""
+    return fetch_source(url)[0]
+
+
+def detect_date_format(values, sample_size=50):
+    """The strftime format that parses the most of a sample of ``values`` (or None).
+
+    Candidates come from guessing each sampled value both month-first and
+    day-first, so a sheet of ``13/04/2025``-style dates is not read as
+    month-first just because its first rows happen to be ambiguous.
+    """
+    sample = pd.Series(values, dtype=object).dropna().astype(str).str.strip()
+    sample = sample[sample != ""].drop_duplicates()
+    sample = sample.sample(min(sample_size, len(sample)), random_state=0) if len(sample) else sample
+    guesses = Counter()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for value in sample:
+            for dayfirst in (False, True):
+                fmt = guess_datetime_format(value, dayfirst=dayfirst)
+                if fmt:
+                    guesses[fmt] += 1
+    best, best_parsed = None, 0
+    for fmt, _ in guesses.most_common():
+        parsed = pd.to_datetime(sample, format=fmt, errors='coerce').notna().sum()
+        if parsed > best_parsed:
+            best, best_parsed = fmt, parsed
+    return best
+
+
+def parse_dates(values, fmt=None):
+    """Parse a date column with one explicit format, per value only where that fails.
+
+    Works on the distinct values, so a multi-year column costs one parse per
+    calendar day rather than one per row. Values no format can read become
+    NaT, as with ``errors='coerce'``.
+    """
+    codes, uniques = pd.factorize(values)
+    text = pd.Series(uniques, dtype=object).astype(str).str.strip()
+    fmt = fmt or detect_date_format(text)
+    if fmt:
+        parsed = pd.to_datetime(text, format=fmt, errors='coerce')
+    else:
+        parsed = pd.Series(pd.NaT, index=text.index, dtype="datetime64[ns]")
+    outliers = parsed.isna() & (text != "")
+    if outliers.any():
+        parsed[outliers] = pd.to_datetime(text[outliers], format="mixed", errors='coerce')
+    lookup = np.append(parsed.to_numpy(dtype="datetime64[ns]"), np.datetime64("NaT", "ns"))
+    return pd.Series(lookup[codes], index=values.index, name=values.name), fmt
+
+
+def _type_dates(df, date_formats=None):
+    """Parse both date columns; the formats used are recorded in ``df.attrs["date_formats"]``."""
+    date_formats = dict(date_formats or {})
+    for col in date_cols:
+        if col in df.columns:
+            df[col], date_formats[col] = parse_dates(df[col], date_formats.get(col))
+    df.attrs["date_formats"] = date_formats
+    return df
+
+
+def _categorical(values, clean=None):
+    """``values`` as a categorical, applying ``clean`` to each distinct value only.
+
+    Missing values are cleaned as the text ``"nan"``, exactly like the
+    ``.astype(str)`` the dashboard always normalised with.
+    """
+    if clean is None:
+        return values.astype("category")
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    cleaned = clean(pd.Series(uniques, dtype=object).astype(str))
+    remap, categories = pd.factorize(cleaned, sort=True)
+    return pd.Series(
+        pd.Categorical.from_codes(remap[codes], categories=categories),
+        index=values.index, name=values.name,
+    )
+
+
+def _normalise(df):
+    """Strip/case-fold status, department and frequency once and store the text columns as categoricals."""
+    cleaners = {
+        status_col: lambda s: s.str.strip().str.lower(),
+        dept_col: lambda s: s.str.strip().str.upper(),
+        frequency_col: lambda s: s.str.strip(),
+    }
+    for col in categorical_cols:
+        if col in df.columns:
+            df[col] = _categorical(df[col], cleaners.get(col))
+    return df
+
+
+def parse_csv_bytes(raw, skip_rows=0, date_formats=None):
+    """Parse sheet CSV bytes the way the dashboard always has (python engine), then type the dates."""
+    df = pd.read_csv(io.BytesIO(raw), on_bad_lines='skip', engine='python', skiprows=skip_rows)
+    df.columns = [col.strip() for col in df.columns]
+    return _normalise(_type_dates(df, date_formats))
+
+
+def _header_names(raw, skip_rows):
+    """Column names exactly as written in the header line (untrimmed)."""
+    start = _header_end(raw, skip_rows - 1) if skip_rows else 0
+    header = raw[start:_header_end(raw, skip_rows)].decode("utf-8", "replace").rstrip("\r\n")
+    return next(csv.reader([header]), [])
+
+
+def parse_csv_fast(raw, skip_rows=0, date_formats=None):
+    """Parse sheet CSV bytes with the multithreaded Arrow reader.
+
+    Only ``used_cols`` are materialised, all as strings, and the two date
+    columns are typed afterwards. Rows whose field count does not match the
+    header are not silently dropped: they come back in the second return
+    value (``expected``, ``actual``, ``text``) so they can be reported.
+    """
+    names = _header_names(raw, skip_rows)
+    wanted = {col: name for name in names for col in used_cols if name.strip() == col}
+    bad_lines = []
+
+    def quarantine(row):
+        bad_lines.append((row.expected_columns, row.actual_columns, row.text))
+        return "skip"
+
+    table = pa_csv.read_csv(
+        io.BytesIO(raw),
+        read_options=pa_csv.ReadOptions(skip_rows=skip_rows),
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True, invalid_row_handler=quarantine),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=list(wanted.values()),
+            column_types={name: pa.string() for name in wanted.values()},
+            strings_can_be_null=True,
+        ),
+    )
+    df = table.to_pandas()
+    df.columns = [col.strip() for col in df.columns]
+    for col in df.columns:
+        df[col] = df[col].fillna(np.nan)
+    bad = pd.DataFrame(bad_lines, columns=["expected", "actual", "text"])
+    return _normalise(_type_dates(df, date_formats)), bad
+
+
+def _append_rows(df, tail):
+    """``df`` followed by ``tail``, merging categorical columns' categories."""
+    columns = {}
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            columns[col] = union_categoricals([df[col], tail[col]], sort_categories=True)
+        else:
+            columns[col] = pd.concat([df[col], tail[col]], ignore_index=True)
+    return pd.DataFrame(columns)
+
+
+def _concat_frames(frames):
+    """``frames`` stacked in order; categorical columns keep one merged category set
+    and columns missing from some frames are filled with NaN."""
+    columns = list(dict.fromkeys(col for frame in frames for col in frame.columns))
+    merged = {}
+    for col in columns:
+        present = [frame[col] for frame in frames if col in frame.columns]
+        if any(isinstance(part.dtype, pd.CategoricalDtype) for part in present):
+            parts = [
+                frame[col] if col in frame.columns
+                else pd.Series(pd.Categorical([np.nan] * len(frame), categories=pd.Index([], dtype=object)))
+                for frame in frames
+            ]
+            parts = [part if isinstance(part.dtype, pd.CategoricalDtype) else part.astype("category") for part in parts]
+            merged[col] = union_categoricals(parts, sort_categories=True)
+        else:
+            parts = [frame[col] if col in frame.columns else pd.Series(np.nan, index=frame.index) for frame in frames]
+            merged[col] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(merged, columns=columns)
+
+
+def _header_end(raw, skip_rows):
+    """Byte offset just past the header line (after ``skip_rows`` leading lines)."""
+    pos = 0
+    for _ in range(skip_rows + 1):
+        nl = raw.find(b"\n", pos)
+        if nl == -1:
+            return len(raw)
+        pos = nl + 1
+    return pos
+
+
+# --- Columnar snapshot ---
+def _snapshot_paths(url, snapshot_dir):
+    key = hashlib.sha1(url.encode()).hexdigest()[:16]
+    snapshot_dir = Path(snapshot_dir)
+    return snapshot_dir / f"{key}.feather", snapshot_dir / f"{key}.json"
+
+
+def _quarantine_path(url, snapshot_dir):
+    return _snapshot_paths(url, snapshot_dir)[0].with_suffix(".quarantine.csv")
+
+
+def _write_quarantine(url, snapshot_dir, bad, append=False):
+    path = _quarantine_path(url, snapshot_dir)
+    try:
+        if append:
+            if not bad.empty:
+                bad.to_csv(path, mode="a", header=not path.exists(), index=False)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            bad.to_csv(path, index=False)
+    except OSError:
+        pass
+
+
+def read_quarantine(url, snapshot_dir=SNAPSHOT_DIR):
+    """Malformed sheet lines set aside by the fast ingestion path (may be empty)."""
+    path = _quarantine_path(url, snapshot_dir)
+    if not path.exists():
+        return pd.DataFrame(columns=["expected", "actual", "text"])
+    return pd.read_csv(path)
+
+
+def _read_snapshot_meta(url, snapshot_dir):
+    data_path, meta_path = _snapshot_paths(url, snapshot_dir)
+    if not (data_path.exists() and meta_path.exists()):
+        return None
+    try:
+        return json.loads(meta_path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _read_snapshot_frame(url, snapshot_dir):
+    data_path = _snapshot_paths(url, snapshot_dir)[0]
+    try:
+        df = feather.read_table(data_path, memory_map=True).to_pandas()
+    except Exception:
+        return None
+    # Arrow hands nulls back as None; keep the NaN that read_csv produces.
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].fillna(np.nan)
+    return df
+
+
+def _write_snapshot(url, snapshot_dir, df, meta):
+    """Atomically replace the snapshot; ``df=None`` rewrites only the sidecar."""
+    data_path, meta_path = _snapshot_paths(url, snapshot_dir)
+    tmp_data = data_path.with_suffix(".feather.tmp")
+    tmp_meta = meta_path.with_suffix(".json.tmp")
+    try:
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+        if df is not None:
+            df.reset_index(drop=True).to_feather(tmp_data)
+        tmp_meta.write_text(json.dumps(meta))
+        if df is not None:
+            os.replace(tmp_data, data_path)
+        os.replace(tmp_meta, meta_path)
+    except OSError:
+        # A read-only deployment still works, it just re-parses every time.
+        pass
+
+
+def _watermark(df):
+    """Latest date seen in either date column, as ISO text (or None)."""
+    stamps = [df[col].max() for col in date_cols if col in df.columns]
+    stamps = [s for s in stamps if pd.notna(s)]
+    return max(stamps).isoformat() if stamps else None
+
+
+def _snapshot_meta(df, raw, data_version, skip_rows, fast, validators, date_formats):
+    return {
+        "skip_rows": skip_rows,
+        "fast": fast,
+        "offset": len(raw),
+        "sha256": data_version,
+        "rows": len(df),
+        "watermark": _watermark(df),
+        "date_formats": date_formats,
+        "etag": validators.get("etag"),
+        "last_modified": validators.get("last_modified"),
+    }
+
+
+# Last frame handed out per snapshot, so a "not modified" answer from the
+# source costs neither a parse nor a Feather read.
+_loaded_frames = {}
+
+
+def _remember_frame(url, snapshot_dir, data_version, df, keep_in_memory):
+    data_path = _snapshot_paths(url, snapshot_dir)[0]
+    if keep_in_memory:
+        _loaded_frames[data_path] = (data_version, df)
+    else:
+        _loaded_frames.pop(data_path, None)
+
+
+def _snapshot_frame(url, snapshot_dir, data_version, keep_in_memory=True):
+    """The stored frame for ``data_version``, from memory when possible."""
+    loaded = _loaded_frames.get(_snapshot_paths(url, snapshot_dir)[0])
+    if loaded is not None and loaded[0] == data_version:
+        return loaded[1]
+    df = _read_snapshot_frame(url, snapshot_dir)
+    if df is not None:
+        _remember_frame(url, snapshot_dir, data_version, df, keep_in_memory)
+    return df
+
+
+def load_sheet(url, skip_rows=0, snapshot_dir=SNAPSHOT_DIR, fast=True, timings=None, keep_in_memory=True):
+    """Load the sheet through the local Feather snapshot.
+
+    The snapshot stores the parsed, typed rows plus the byte length, SHA-256
+    and HTTP validators (ETag/Last-Modified) of the CSV they came from. The
+    source is fetched conditionally with those validators; a 304 reuses the
+    frame already in memory (or the Feather file) without parsing anything.
+    When a fresh download still starts with the stored bytes and those
+    ended on a line break, only the appended tail is parsed and added to
+    the snapshot; anything else (an edit to stored rows, or stored bytes
+    that stopped mid-line) falls back to a full parse.
+
+    ``fast`` selects :func:`parse_csv_fast` (malformed lines go to the
+    report read by :func:`read_quarantine`); ``fast=False`` keeps the
+    original python-engine parse of every column.
+
+    Returns ``(df, data_version)`` where ``data_version`` is the SHA-256 of
+    the downloaded CSV. If given, ``timings`` (a dict) gets the seconds
+    spent downloading (``"download"``), parsing (``"parse"``) and writing
+    the snapshot (``"snapshot"``). ``keep_in_memory=False`` does not keep
+    the frame around for the next call (a 304 then reads the Feather file),
+    for callers that hand the rows on and drop them.
+    """
+    timings = {} if timings is None else timings
+
+    def fetch(*validators):
+        start = time.perf_counter()
+        try:
+            return fetch_source(url, *validators)
+        finally:
+            timings["download"] = timings.get("download", 0.0) + time.perf_counter() - start
+
+    meta = _read_snapshot_meta(url, snapshot_dir)
+    if meta is not None and (meta.get("skip_rows") != skip_rows or meta.get("fast") != fast):
+        meta = None
+
+    if meta is not None:
+        raw, validators = fetch(meta.get("etag"), meta.get("last_modified"))
+        if raw is None:
+            df = _snapshot_frame(url, snapshot_dir, meta["sha256"], keep_in_memory)
+            if df is not None:
+                return df, meta["sha256"]
+            # Snapshot vanished underneath us: fetch it all again.
+            meta = None
+            raw, validators = fetch()
+    else:
+        raw, validators = fetch()
+    data_version = hashlib.sha256(raw).hexdigest()
+
+    def parse(chunk, date_formats=None):
+        start = time.perf_counter()
+        if fast:
+            parsed = parse_csv_fast(chunk, skip_rows=skip_rows, date_formats=date_formats)
+        else:
+            parsed = (
+                parse_csv_bytes(chunk, skip_rows=skip_rows, date_formats=date_formats),
+                pd.DataFrame(columns=["expected", "actual", "text"]),
+            )
+        timings["parse"] = time.perf_counter() - start
+        return parsed
+
+    def keep(df, date_formats, frame_changed=True):
+        start = time.perf_counter()
+        meta = _snapshot_meta(df, raw, data_version, skip_rows, fast, validators, date_formats)
+        _write_snapshot(url, snapshot_dir, df if frame_changed else None, meta)
+        timings["snapshot"] = time.perf_counter() - start
+        _remember_frame(url, snapshot_dir, data_version, df, keep_in_memory)
+        return df, data_version
+
+    if meta is not None:
+        offset = meta["offset"]
+        unchanged = meta["sha256"] == data_version
+        # The stored bytes must end on a line break: the published CSV has no
+        # trailing newline, so lengthening the last row's final cell would
+        # otherwise also look like an append.
+        appended = (
+            len(raw) > offset
+            and raw[offset - 1:offset] == b"\n"
+            and hashlib.sha256(raw[:offset]).hexdigest() == meta["sha256"]
+        )
+        df = _snapshot_frame(url, snapshot_dir, meta["sha256"], keep_in_memory) if unchanged or appended else None
+        if df is not None and unchanged:
+            # Same bytes behind new validators: just remember the validators.
+            return keep(df, meta.get("date_formats", {}), frame_changed=False)
+        if df is not None:
+            # Parse the new rows with the formats detected for the stored ones.
+            header = raw[:_header_end(raw, skip_rows)]
+            tail, bad = parse(header + raw[offset:], meta.get("date_formats"))
+            same_schema = (
+                list(tail.columns) == list(df.columns)
+                and (tail.empty or (tail.dtypes.astype(str) == df.dtypes.astype(str)).all())
+            )
+            if same_schema:
+                _write_quarantine(url, snapshot_dir, bad, append=True)
+                return keep(_append_rows(df, tail), tail.attrs["date_formats"])
+
+    df, bad = parse(raw)
+    _write_quarantine(url, snapshot_dir, bad)
+    return keep(df, df.attrs["date_formats"])
+
+
+def source_name(url):
+    """Short label for a source: its ``gid`` for a published Google Sheet tab, else the file name."""
+    query = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
+    if "gid" in query:
+        return f"gid {query['gid'][0]}"
+    return Path(urllib.parse.urlparse(url).path).name or url
+
+
+def _named_sources(sources):
+    """``{label: url}`` for ``sources``; labels that :func:`source_name` gives
+    more than one source (say two spreadsheets' ``gid=0`` tabs) get a `` #2``,
+    `` #3``... suffix so no tab is dropped."""
+    if isinstance(sources, str):
+        sources = [sources]
+    if isinstance(sources, dict):
+        return dict(sources)
+    repeated = [url for url, seen in Counter(sources).items() if seen > 1]
+    if repeated:
+        raise ValueError(f"Sheet sources listed more than once: {repeated}")
+    named = {}
+    for url in sources:
+        name = label = source_name(url)
+        suffix = 1
+        while label in named:
+            suffix += 1
+            label = f"{name} #{suffix}"
+        named[label] = url
+    return named
+
+
+def load_sheets(sources, skip_rows=0, snapshot_dir=SNAPSHOT_DIR, fast=True, timings=None, max_workers=8, keep_in_memory=True):
+    """Load several published tabs concurrently and stack them with a ``Source`` column.
+
+    ``sources`` is a list of URLs/paths, or a ``{name: url}`` dict to choose
+    the ``Source`` labels (by default :func:`source_name`). Every tab goes
+    through :func:`load_sheet` (its own snapshot and conditional fetch) on a
+    thread pool sharing the pooled HTTP session, and must have all of
+    ``required_cols``; otherwise ``ValueError`` names each offending tab.
+
+    Returns ``(df, data_version)``; the version is a SHA-256 over the tabs'
+    versions, so it changes when any tab does. A single source is returned
+    exactly as :func:`load_sheet` loads it, without a ``Source`` column.
+    ``keep_in_memory`` is passed on to :func:`load_sheet`.
+    """
+    named = _named_sources(sources)
+    if len(named) == 1:
+        return load_sheet(next(iter(named.values())), skip_rows, snapshot_dir, fast, timings, keep_in_memory)
+    timings = {} if timings is None else timings
+    per_source = {name: {} for name in named}
+
+    def load(name):
+        return load_sheet(named[name], skip_rows, snapshot_dir, fast, per_source[name], keep_in_memory)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(named)))) as pool:
+        loaded = dict(zip(named, pool.map(load, named)))
+    timings["load (concurrent)"] = time.perf_counter() - start
+    for name, steps in per_source.items():
+        for step, seconds in steps.items():
+            timings[f"{name}: {step}"] = seconds
+
+    problems = [
+        f"{name}: missing {[col for col in required_cols if col not in df.columns]}"
+        for name, (df, _) in loaded.items()
+        if any(col not in df.columns for col in required_cols)
+    ]
+    if problems:
+        raise ValueError("Sheet tabs without the required columns: " + "; ".join(problems))
+
+    start = time.perf_counter()
+    frames = []
+    for name, (df, _) in loaded.items():
+        frames.append(df.assign(**{source_col: pd.Categorical([name] * len(df), categories=list(named))}))
+    df = _concat_frames(frames)
+    timings["merge"] = time.perf_counter() - start
+
+    data_version = hashlib.sha256(
+        "".join(f"{name}={version};" for name, (_, version) in loaded.items()).encode()
+    ).hexdigest()
+    return df, data_version
+
+
+def read_quarantines(sources, snapshot_dir=SNAPSHOT_DIR):
+    """:func:`read_quarantine` for every source, stacked with a ``Source`` column when there are several."""
+    named = _named_sources(sources)
+    if len(named) == 1:
+        return read_quarantine(next(iter(named.values())), snapshot_dir)
+    return pd.concat(
+        [read_quarantine(url, snapshot_dir).assign(**{source_col: name}) for name, url in named.items()],
+        ignore_index=True,
+    )
+
+
+# --- Stale-while-revalidate refresh ---
+LoadedSheet = namedtuple("LoadedSheet", ["df", "data_version", "prepared", "loaded_at", "timings"])
+
+
+class SheetRefresher:
+    """Serve the last loaded sheet while a background thread reloads it before it goes stale.
+
+    ``prepare(df, data_version)`` (the page builds the ``metrics`` count
+    cube) runs on every new frame in the background as well, and the result
+    is swapped in as one :class:`LoadedSheet`, so viewers only ever see a
+    complete previous or complete new version. Only the very first :meth:`current` call waits for
+    a download. A failed refresh keeps serving the old version, records the
+    error in ``last_error`` and is retried after ``lead`` seconds.
+
+    With ``keep_frame=False`` (when ``prepare`` moves the rows elsewhere,
+    such as the SQLite store) the parsed rows are dropped once prepared and
+    ``LoadedSheet.df`` is an empty frame that only carries the columns.
+    """
+
+    def __init__(self, sources, ttl=600, lead=60, prepare=None, skip_rows=0, keep_frame=True):
+        # One URL/path, or several tabs merged by :func:`load_sheets`.
+        self.sources = sources
+        self.ttl = ttl
+        self.lead = lead
+        self.prepare = prepare
+        self.skip_rows = skip_rows
+        self.keep_frame = keep_frame
+        self.last_error = None
+        self._current = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _load(self):
+        timings = {}
+        df, data_version = load_sheets(
+            self.sources, skip_rows=self.skip_rows, timings=timings, keep_in_memory=self.keep_frame
+        )
+        previous = self._current
+        if previous is not None and previous.data_version == data_version:
+            prepared = previous.prepared
+        else:
+            start = time.perf_counter()
+            prepared = self.prepare(df, data_version) if self.prepare else None
+            timings["prepare"] = time.perf_counter() - start
+        if not self.keep_frame:
+            # A copy, so the empty frame does not keep the full columns alive.
+            df = df.iloc[:0].copy()
+        self._current = LoadedSheet(df, data_version, prepared, time.time(), timings)
+
+    def current(self):
+        """The latest :class:`LoadedSheet`, loading it synchronously only the first time."""
+        if self._current is None:
+            with self._lock:
+                if self._current is None:
+                    self._load()
+        return self._current
+
+    def refresh(self):
+        """Reload now, in the calling thread."""
+        with self._lock:
+            self._load()
+        return self._current
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="sheet-refresher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        wait = max(self.ttl - self.lead, 1)
+        while not self._stop.wait(wait):
+            try:
+                self.refresh()
+            except Exception as e:
+                self.last_error = e
+                wait = max(self.lead, 1)
+            else:
+                self.last_error = None
+                wait = max(self.ttl - self.lead, 1)
@@ -0,0 +1,199 @@
+"""Optional SQLite store for the sheet rows the dashboard counts.
+
+Set ``QA_STORE`` to a database path to use it: the page then ingests each
+new sheet version into the store (in the background refresher) instead of
+keeping a count cube in memory, and asks SQLite for the selected slice's
+counts. The ``qa_rows`` table holds one row per sheet line that has both
+dates, keyed like :data:`metrics.cube_keys` and indexed on department and
+month and on the QA status date.
+
+Ingestion is incremental: when a new sheet version still starts with the
+rows already stored (the usual case for an append-only sheet), only the
+new rows are inserted. The database runs in WAL mode, so pages keep
+reading the previous version while a refresh writes the next one.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+from metrics import count_col, cube_keys, day_col, month_code, range_summary, slice_report, status_month_col
+from qa_data import date_col, dept_col, frequency_col, qa_col, qa_status_date_col, status_col
+
+STORE_PATH = os.environ.get("QA_STORE")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS qa_rows (
+    department TEXT,
+    month TEXT,
+    status_month TEXT,
+    status_day TEXT,
+    qa TEXT,
+    frequency TEXT,
+    status TEXT
+);
+CREATE INDEX IF NOT EXISTS qa_rows_dept_month ON qa_rows (department, month);
+CREATE INDEX IF NOT EXISTS qa_rows_status_day ON qa_rows (status_day);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+# qa_rows column for each cube key.
+_columns = {
+    dept_col: "department",
+    "Month": "month",
+    status_month_col: "status_month",
+    day_col: "status_day",
+    qa_col: "qa",
+    frequency_col: "frequency",
+    status_col: "status",
+}
+
+
+def _text(values):
+    """``values`` as Python strings with ``None`` for missing entries."""
+    values = values.astype(object)
+    return values.where(values.notna(), None).tolist()
+
+
+def _prefix_hash(df, rows):
+    """Fingerprint of the first ``rows`` sheet lines, to tell an append from an edit."""
+    head = df.iloc[:rows].reset_index(drop=True)
+    return hashlib.sha256(pd.util.hash_pandas_object(head, index=False).to_numpy().tobytes()).hexdigest()
+
+
+def _store_rows(df):
+    """Insert-ready tuples for the lines of ``df`` that have both dates (as :func:`metrics.build_cube` counts them)."""
+    come = df[date_col]
+    qa_date = df[qa_status_date_col]
+    df = df[(come.notna() & qa_date.notna()).to_numpy()]
+    come, qa_date = df[date_col], df[qa_status_date_col]
+    frequency = df[frequency_col] if frequency_col in df.columns else pd.Series("nan", index=df.index)
+    return list(zip(
+        _text(df[dept_col]),
+        come.dt.strftime("%Y-%m").tolist(),
+        qa_date.dt.strftime("%Y-%m").tolist(),
+        qa_date.dt.strftime("%Y-%m-%d").tolist(),
+        _text(df[qa_col]),
+        _text(frequency),
+        _text(df[status_col]),
+    ))
+
+
+class QAStore:
+    """The sheet's rows in SQLite, with the aggregate queries the page needs."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._write_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # A connection per call: Streamlit serves sessions from several threads.
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _meta(self, conn):
+        return dict(conn.execute("SELECT key, value FROM meta"))
+
+    @property
+    def data_version(self):
+        """Sheet version the store currently holds, or ``None`` when empty."""
+        with self._connect() as conn:
+            return self._meta(conn).get("data_version")
+
+    def ingest(self, df, data_version):
+        """Bring the store up to ``df`` (from :func:`qa_data.load_sheets`).
+
+        Only lines after the ones already stored are inserted when the
+        stored lines are unchanged; otherwise the table is rebuilt. Either
+        way it happens in one transaction. Returns the number of lines inserted.
+        """
+        with self._write_lock, self._connect() as conn:
+            meta = self._meta(conn)
+            if meta.get("data_version") == data_version:
+                return 0
+            stored = int(meta.get("lines", 0))
+            appended = 0 < stored <= len(df) and meta.get("prefix") == _prefix_hash(df, stored)
+            if not appended:
+                conn.execute("DELETE FROM qa_rows")
+                stored = 0
+            rows = _store_rows(df.iloc[stored:])
+            conn.executemany("INSERT INTO qa_rows VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.executemany(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                [("data_version", data_version), ("lines", str(len(df))), ("prefix", _prefix_hash(df, len(df)))],
+            )
+        return len(rows)
+
+    def available_months(self, dept):
+        """``YYYY-MM`` months with at least one file for ``dept``, oldest first."""
+        with self._connect() as conn:
+            return [month for (month,) in conn.execute(
+                "SELECT DISTINCT month FROM qa_rows WHERE department = ? ORDER BY month", (dept.upper(),)
+            )]
+
+    def month_counts(self, dept, month):
+        """Cube-shaped counts (see :data:`metrics.cube_keys`) for one department and month."""
+        keys = [key for key in cube_keys if key not in (dept_col, "Month")]
+        columns = ", ".join(_columns[key] for key in keys)
+        with self._connect() as conn:
+            counts = pd.read_sql_query(
+                f"SELECT {columns}, COUNT(*) AS n FROM qa_rows "
+                f"WHERE department = ? AND month = ? GROUP BY {columns}",
+                conn,
+                params=(dept.upper(), month),
+            )
+        counts.columns = keys + [count_col]
+        counts[status_month_col] = counts[status_month_col].map(month_code).astype("int32")
+        counts[day_col] = pd.to_datetime(counts[day_col]).dt.date
+        return counts
+
+    def months(self):
+        """``(dept, month_code, counts)`` for every stored month, like :func:`metrics.cube_months`."""
+        with self._connect() as conn:
+            keys = conn.execute("SELECT DISTINCT department, month FROM qa_rows ORDER BY department, month").fetchall()
+        for dept, month in keys:
+            if dept is not None:
+                yield dept, month_code(month), self.month_counts(dept, month)
+
+    def month_report(self, dept, month):
+        """:func:`metrics.month_report` computed from the store."""
+        return slice_report(self.month_counts(dept, month), dept, month)
+
+    def day_bounds(self, dept):
+        """First and last QA status day stored for ``dept``, or ``None`` when it has none."""
+        with self._connect() as conn:
+            first, last = conn.execute(
+                "SELECT MIN(status_day), MAX(status_day) FROM qa_rows WHERE department = ?", (dept.upper(),)
+            ).fetchone()
+        if first is None:
+            return None
+        return pd.Timestamp(first).date(), pd.Timestamp(last).date()
+
+    def range_report(self, dept, start, end):
+        """:func:`metrics.range_report` for QA status days ``start``..``end``, from the store."""
+        params = (dept.upper(), start.isoformat(), end.isoformat())
+        where = "WHERE department = ? AND status_day BETWEEN ? AND ?"
+        with self._connect() as conn:
+            counts = pd.read_sql_query(f"SELECT qa, status, COUNT(*) AS n FROM qa_rows {where} GROUP BY qa, status", conn, params=params)
+            daily_counts = pd.read_sql_query(
+                f"SELECT status_day, COUNT(*) AS n FROM qa_rows {where} GROUP BY status_day ORDER BY status_day", conn, params=params
+            )
+        # An empty range unstacks to float columns; keep counts integral like the cube's.
+        table = counts.set_index(["qa", "status"])["n"].unstack("status", fill_value=0).fillna(0).astype("int64")
+        table = table.rename_axis(index=qa_col, columns=status_col)
+        daily_counts.columns = [day_col, "File Count"]
+        daily_counts[day_col] = pd.to_datetime(daily_counts[day_col]).dt.date
+        return range_summary(table, daily_counts, dept, start, end)
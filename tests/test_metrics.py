@@ -0,0 +1,43 @@
+"""The metrics module must give the page's original numbers for every month.
+
+The original side starts from the page's python-engine parse of the raw CSV
+(dates typed with ``pd.to_datetime``, statuses stripped and lowered per
+department); the new side from ``parse_csv_fast`` and the count cube.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.bench_metrics import assert_same, cube_metrics, legacy_frame, legacy_metrics, legacy_rows  # noqa: E402
+from benchmarks.synthetic import make_sheet  # noqa: E402
+from metrics import build_cube, month_slice, status_crosstab  # noqa: E402
+from qa_data import parse_csv_fast  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def raw():
+    return make_sheet(20_000, days=400).to_csv(index=False).encode()
+
+
+@pytest.fixture(scope="module")
+def cube(raw):
+    sheet, bad_lines = parse_csv_fast(raw)
+    assert bad_lines.empty
+    return build_cube(sheet)
+
+
+@pytest.mark.parametrize("dept", ["QC", "QA"])
+def test_month_metrics_match_original_page(raw, cube, dept):
+    rows = legacy_rows(legacy_frame(raw), dept)
+    months = sorted(rows["Month"].unique())
+    assert len(months) > 10
+    for month in months:
+        assert_same(legacy_metrics(rows, month), cube_metrics(status_crosstab(month_slice(cube, dept, month)), month))
+
+
+def test_department_without_rows(cube):
+    kpis = cube_metrics(status_crosstab(month_slice(cube, "Dev QA", "2023-05")), "2023-05")[0]
+    assert [kpis[key] for key in ("total", "done", "revised", "reject")] == [0, 0, 0, 0]
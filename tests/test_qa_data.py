@@ -0,0 +1,142 @@
+"""The sheet snapshot must always hold what a full parse of the current CSV gives."""
+import http.server
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import qa_data  # noqa: E402
+from benchmarks.synthetic import make_sheet  # noqa: E402
+from qa_data import load_sheet, parse_csv_fast, read_quarantine, status_col  # noqa: E402
+
+
+def sheet_csv(rows, seed=0):
+    """Synthetic sheet CSV with the status as the last column and, like the
+    published Google CSV, no trailing newline."""
+    df = make_sheet(rows, seed=seed, bad_date_rate=0)
+    df = df[[col for col in df.columns if col != status_col] + [status_col]]
+    df[status_col] = "QA Done"
+    return df.to_csv(index=False).encode().rstrip(b"\n")
+
+
+def test_lengthened_last_cell_is_not_read_as_an_append(tmp_path):
+    source, snapshots = tmp_path / "sheet.csv", tmp_path / "snapshots"
+    source.write_bytes(sheet_csv(200))
+    load_sheet(str(source), snapshot_dir=snapshots)
+
+    edited = sheet_csv(200) + b"/Revised"
+    source.write_bytes(edited)
+    df, data_version = load_sheet(str(source), snapshot_dir=snapshots)
+
+    assert df[status_col].iloc[-1] == "qa done/revised"
+    pd.testing.assert_frame_equal(df, parse_csv_fast(edited)[0])
+    assert read_quarantine(str(source), snapshots).empty
+    # A later unchanged fetch keeps serving the corrected snapshot.
+    source.write_bytes(edited)
+    again, _ = load_sheet(str(source), snapshot_dir=snapshots)
+    assert again[status_col].iloc[-1] == "qa done/revised"
+
+
+def test_rows_appended_after_a_line_break_parse_only_the_tail(tmp_path, monkeypatch):
+    source, snapshots = tmp_path / "sheet.csv", tmp_path / "snapshots"
+    first = sheet_csv(200) + b"\n"
+    source.write_bytes(first)
+    load_sheet(str(source), snapshot_dir=snapshots)
+
+    grown = first + sheet_csv(30, seed=1).split(b"\n", 1)[1]
+    source.write_bytes(grown)
+    parsed = []
+    monkeypatch.setattr(qa_data, "parse_csv_fast", lambda raw, **kwargs: parsed.append(len(raw)) or parse_csv_fast(raw, **kwargs))
+    df, _ = load_sheet(str(source), snapshot_dir=snapshots)
+
+    assert parsed and parsed[0] < len(grown) // 2
+    pd.testing.assert_frame_equal(df, parse_csv_fast(grown)[0])
+
+
+class SheetHandler(http.server.BaseHTTPRequestHandler):
+    """Serves ``server.body`` with ``server.etag``, answering 304 to a matching ``If-None-Match``."""
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse shows up
+
+    def do_GET(self):
+        self.server.requests.append((self.client_address, self.headers.get("If-None-Match"), self.headers.get("If-Modified-Since")))
+        if self.headers.get("If-None-Match") == self.server.etag:
+            self.send_response(304)
+            self.send_header("ETag", self.server.etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", self.server.etag)
+        self.send_header("Last-Modified", self.server.last_modified)
+        self.send_header("Content-Length", str(len(self.server.body)))
+        self.end_headers()
+        self.wfile.write(self.server.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def sheet_server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), SheetHandler)
+    server.body, server.etag, server.last_modified = sheet_csv(200), '"v1"', "Mon, 02 Jun 2025 08:00:00 GMT"
+    server.requests = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    """Sizes of the CSV chunks load_sheet parses."""
+    parsed = []
+    monkeypatch.setattr(qa_data, "parse_csv_fast", lambda raw, **kwargs: parsed.append(len(raw)) or parse_csv_fast(raw, **kwargs))
+    return parsed
+
+
+def test_http_not_modified_reuses_the_cached_frame(sheet_server, parses, tmp_path):
+    url = f"http://127.0.0.1:{sheet_server.server_port}/sheet.csv"
+    first, version = load_sheet(url, snapshot_dir=tmp_path)
+    meta = json.loads(qa_data._snapshot_paths(url, tmp_path)[1].read_text())
+    assert (meta["etag"], meta["last_modified"]) == ('"v1"', sheet_server.last_modified)
+
+    again, again_version = load_sheet(url, snapshot_dir=tmp_path)
+
+    assert again is first and again_version == version
+    assert len(parses) == 1
+    assert sheet_server.requests[1][1:] == ('"v1"', sheet_server.last_modified)
+    # Both requests went over one pooled keep-alive connection.
+    assert sheet_server.requests[0][0] == sheet_server.requests[1][0]
+
+
+def test_http_new_etag_same_bytes_rewrites_only_the_sidecar(sheet_server, parses, tmp_path):
+    url = f"http://127.0.0.1:{sheet_server.server_port}/sheet.csv"
+    first, version = load_sheet(url, snapshot_dir=tmp_path)
+    data_path, meta_path = qa_data._snapshot_paths(url, tmp_path)
+    data_stat = data_path.stat()
+
+    sheet_server.etag = '"v2"'
+    again, again_version = load_sheet(url, snapshot_dir=tmp_path)
+
+    assert again is first and again_version == version
+    assert len(parses) == 1
+    assert json.loads(meta_path.read_text())["etag"] == '"v2"'
+    assert (data_path.stat().st_mtime_ns, data_path.stat().st_ino) == (data_stat.st_mtime_ns, data_stat.st_ino)
+
+
+def test_http_changed_body_is_parsed_again(sheet_server, parses, tmp_path):
+    url = f"http://127.0.0.1:{sheet_server.server_port}/sheet.csv"
+    _, version = load_sheet(url, snapshot_dir=tmp_path)
+
+    sheet_server.body, sheet_server.etag = sheet_csv(200, seed=1), '"v3"'
+    df, new_version = load_sheet(url, snapshot_dir=tmp_path)
+
+    assert new_version != version
+    assert parses == [len(sheet_csv(200)), len(sheet_server.body)]
+    pd.testing.assert_frame_equal(df, parse_csv_fast(sheet_server.body)[0])
+    assert json.loads(qa_data._snapshot_paths(url, tmp_path)[1].read_text())["etag"] == '"v3"'
@@ -0,0 +1,44 @@
+"""The SQLite store must report what the in-memory cube reports."""
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.synthetic import make_sheet  # noqa: E402
+from metrics import build_cube, build_daily_totals, range_report  # noqa: E402
+from qa_data import parse_csv_fast  # noqa: E402
+from qa_store import QAStore  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def sheet():
+    return parse_csv_fast(make_sheet(5_000, start="2024-01-01", days=120).to_csv(index=False).encode())[0]
+
+
+@pytest.fixture(scope="module")
+def store(sheet, tmp_path_factory):
+    store = QAStore(tmp_path_factory.mktemp("store") / "qa.sqlite")
+    store.ingest(sheet, "v1")
+    return store
+
+
+@pytest.mark.parametrize("start, end", [
+    (date(2024, 2, 1), date(2024, 2, 29)),
+    (date(2023, 11, 1), date(2023, 12, 31)),  # before the data starts
+])
+def test_range_report_matches_the_cube(sheet, store, start, end):
+    from_cube = range_report(build_daily_totals(build_cube(sheet)), "QC", start, end)
+    from_store = store.range_report("QC", start, end)
+
+    assert from_store["kpis"] == from_cube["kpis"]
+    # Both backends format the same way on the page ("0", not "0.0").
+    assert f"{from_store['kpis']['total']:,}" == f"{from_cube['kpis']['total']:,}"
+    assert list(from_store["daily_counts"]["File Count"]) == list(from_cube["daily_counts"]["File Count"])
+
+
+def test_department_without_rows(store):
+    kpis = store.range_report("Dev QA", date(2024, 2, 1), date(2024, 2, 29))["kpis"]
+    assert f"{kpis['total']:,}" == "0"
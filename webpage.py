@@ -1,14 +1,25 @@
 import pandas as pd
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
-import numpy as np
-from PIL import Image
-from datetime import datetime
-import os
-import base64
-import streamlit.components.v1 as components
-import json
+from datetime import datetime, timedelta
+import time
+from metrics import (
+    build_cube, departments, available_months as months_for, month_report,
+    build_daily_totals, range_report, range_presets, preset_range, previous_range,
+    MonthlyAggregates, cube_months, qa_page, qa_page_size, qa_rank_cols,
+    done_str, reject_str,
+)
+from charts import (
+    daily_trend_figure, daily_status_figure, frequency_figure, trend_figure,
+    frequency_table,
+)
+from qa_charts import qa_charts
+from qa_data import (
+    SHEET_URLS, SheetRefresher, read_quarantines, required_cols,
+    qa_col, frequency_col,
+)
+from qa_store import STORE_PATH, QAStore
+from profiling import Profiler, count_miss
+from assets import LOGO, FOOTER_LOGO, asset_path, asset_version, thumbnail_data
 
 # --- Streamlit Configuration and Styling ---
 st.set_page_config(
@@ -17,6 +28,10 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
+# --- Opt-in profiling: open the page with ?profile=1 ---
+profiler = Profiler(enabled=st.query_params.get("profile") in ("1", "true"))
+profiler.lap("Page styling")
+
 # --- Page Background Styling (Light Violet) ---
 st.markdown("""
     <style>
@@ -128,66 +143,113 @@ div[data-testid="stSelectbox"] *:focus {
 
 
 # --- Data Loading ---
-sheet_url = "https://docs.google.com/spreadsheets/d/e/2PACX-1vQfmDvoHtr58LTd1MhYyI2s3uJqt6YbXklFt6JZ2pm6aQtriz1vz4kwGtHoY1-a9EH0M4cMnD74gk7O/pub?gid=2104660007&single=true&output=csv"
-@st.cache_data(ttl=600)
-def load_data(url, skip_rows=0):
-    try:
-        df = pd.read_csv(url, on_bad_lines='skip', engine='python', skiprows=skip_rows)
-    except Exception as e:
-        st.error(f"⚠️ Error loading data from URL: {e}")
-        st.stop()
-    return df
+profiler.lap("Sheet (background refresher)")
+sheet_urls = tuple(SHEET_URLS)
+def prepare_sheet(df, data_version):
+    """Background preprocessing for each new sheet version: the count cube, or
+    the rows appended to the SQLite store when QA_STORE is set."""
+    if any(col not in df.columns for col in required_cols):
+        return None
+    if STORE_PATH:
+        store = QAStore(STORE_PATH)
+        store.ingest(df, data_version)
+        return store
+    return build_cube(df)
+
+@st.cache_resource
+def sheet_refresher(urls):
+    """One refresher per app process; it reloads the sheet tabs (concurrently) and
+    rebuilds the cube in the background a minute before the 10-minute refresh interval is up."""
+    count_miss("sheet_refresher")
+    # In store mode the rows live in SQLite; the refresher keeps only the columns.
+    return SheetRefresher(list(urls), ttl=600, lead=60, prepare=prepare_sheet, keep_frame=not STORE_PATH).start()
+
+@st.cache_data(ttl=600, max_entries=64)
+def load_report(_cube, data_version, dept, month):
+    """Everything the page shows for one department and month; ``data_version`` keys the cache, not the cube."""
+    count_miss("load_report")
+    if isinstance(_cube, QAStore):
+        return _cube.month_report(dept, month)
+    return month_report(_cube, dept, month)
+
+@st.cache_resource(max_entries=64)
+def month_figures(_report, dept, month, data_version):
+    """The month's Plotly figures, built once per (department, month, data version).
+
+    Kept as figure objects rather than JSON: st.plotly_chart re-validates a
+    dict into a new Figure, which costs about as much as building it. The
+    cached figures are shared between sessions and must not be modified.
+    """
+    count_miss("month_figures")
+    return {
+        "daily_trend": daily_trend_figure(_report["daily_counts"]),
+        "daily_status": daily_status_figure(_report["daily_status"]),
+        "frequency": frequency_figure(_report["frequency_summary"]),
+    }
+
+@st.cache_resource(max_entries=2)
+def daily_totals(_cube, data_version):
+    """Running per-day totals behind the date-range section, built once per data version."""
+    count_miss("daily_totals")
+    return build_daily_totals(_cube)
 
-df = load_data(sheet_url)
+@st.cache_resource
+def monthly_aggregates():
+    """Per-month aggregates shared by all sessions; each data version only regroups the months that changed."""
+    count_miss("monthly_aggregates")
+    return MonthlyAggregates()
+
+@st.cache_resource(max_entries=4)
+def load_trends(_cube, data_version, dept):
+    count_miss("load_trends")
+    slices = _cube.months() if isinstance(_cube, QAStore) else cube_months(_cube)
+    return monthly_aggregates().trends(dept, slices, data_version)
+
+@st.cache_data(ttl=600)
+def load_quarantine(urls, data_version):
+    count_miss("load_quarantine")
+    return read_quarantines(list(urls))
+
+try:
+    refresher = profiler.cached("sheet_refresher", sheet_refresher, sheet_urls)
+    sheet = refresher.current()
+except Exception as e:
+    st.error(f"⚠️ Error loading data from URL: {e}")
+    st.stop()
+# A failed background refresh keeps the last good data; say so instead of serving it silently.
+data_age = time.time() - sheet.loaded_at
+if refresher.last_error is not None or data_age > refresher.ttl:
+    loaded = datetime.fromtimestamp(sheet.loaded_at).strftime("%d %b %Y %H:%M")
+    reason = f" The last refresh failed: {refresher.last_error}" if refresher.last_error is not None else ""
+    st.warning(f"⚠️ Showing data loaded at {loaded} ({data_age / 60:.0f} min ago).{reason}")
+df, data_version, cube = sheet.df, sheet.data_version, sheet.prepared
+bad_lines = profiler.cached("load_quarantine", load_quarantine, sheet_urls, data_version)
 
 # --- Department Selector (added early before filtering)
+profiler.lap("Header & selectors")
 selected_dept = st.radio(
     "Select Department:",
-    options=["QC", "QA"],
+    options=departments,
     index=0,
     horizontal=True
 )
 # --- Preprocessing ---
-df.columns = [col.strip() for col in df.columns]
-
-project_col = "Project Name as per the SOW"
-date_col = "File come for QA Date"
-status_col = "QA Status"
-feed_site_col = "Feed(Site) Name"
-qa_col = "QA Name"
-dept_col = "Department"
-qa_status_date_col = "QA status - Date"
-frequency_col = "Frequency"
-
-
-required_cols = [project_col, date_col, status_col, feed_site_col, qa_col, dept_col, qa_status_date_col]
 missing = [col for col in required_cols if col not in df.columns]
 if missing:
     st.error(f"🚫 Required columns are missing in the data: {missing}")
     st.stop()
 
-df = df[df[dept_col].astype(str).str.strip().str.upper() == selected_dept.upper()].copy()
-df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
-df[qa_status_date_col] = pd.to_datetime(df[qa_status_date_col], errors='coerce')
-df = df.dropna(subset=[date_col, qa_status_date_col])
-
-df["Month"] = df[date_col].dt.to_period("M").astype(str)
-df[status_col] = df[status_col].astype(str).str.strip().str.lower()
-
-done_str = "qa done"
-reject_str = "qa rejected"
-revised_str = "qa done/revised"
-
-available_months = sorted(df["Month"].unique())
+available_months = cube.available_months(selected_dept) if isinstance(cube, QAStore) else months_for(cube, selected_dept)
 if not available_months:
     st.warning(f"🧐 No valid months found after filtering for {selected_dept} department.")
     st.stop()
 
-# --- Function: Convert Image to Base64 ---
-def image_to_base64(img_path):
-    with open(img_path, "rb") as img_file:
-        b64_string = base64.b64encode(img_file.read()).decode()
-    return b64_string
+# --- Function: Resized, base64-encoded image (shared by all sessions) ---
+@st.cache_data(max_entries=16)
+def load_thumbnail(path, version, display_px, scale=2):
+    """``(mime_type, base64)`` of the image shrunk for ``display_px``; ``version`` (the file's mtime) keys the cache."""
+    count_miss("load_thumbnail")
+    return thumbnail_data(path, display_px, scale)
 
 # --- Header & Logo ---
 col_left, col_right = st.columns([0.80, 0.20])
@@ -206,9 +268,11 @@ with col_left:
     """, unsafe_allow_html=True)
 
 with col_right:
-    image_path = "D:/KSDB NANDAN/QA Desbord/monthy_web/logo2.jpg"
-    if os.path.exists(image_path):
-        img_b64 = image_to_base64(image_path)
+    image_path = asset_path(LOGO)
+    image_version = asset_version(image_path)
+    if image_version is not None:
+        # Shown at 150 px and zoomed 2x on hover.
+        img_mime, img_b64 = profiler.cached("load_thumbnail", load_thumbnail, str(image_path), image_version, 150)
         st.markdown(f"""
             <style>
                 .img_b64 {{
@@ -221,7 +285,7 @@ with col_right:
             </style>
 
             <div style="display: flex; justify-content: center;">
-                <img class="img_b64" src="data:image/jpeg;base64,{img_b64}" width="150"
+                <img class="img_b64" src="data:{img_mime};base64,{img_b64}" width="150"
                      style="border-radius: 50%; box-shadow: 0 2px 6px rgba(0,0,0,0.1); cursor: pointer;">
             </div>
         """, unsafe_allow_html=True)
@@ -231,61 +295,7 @@ with col_right:
 
 
 
-# --- Month Selector ---
-col1, col2 = st.columns([0.2, 0.8])
-with col1:
-    selected_month = st.selectbox(
-        "Select a Month",
-        options=available_months,
-        index=len(available_months) - 1
-    )
-
-filtered = df[df["Month"] == selected_month]
-# --- Stop if no data
-if filtered.empty:
-    st.info(f"No QA records found for **{selected_month}** in the {selected_dept} department.")
-    st.stop()
-# --- Count each status ---
-done_count = (filtered[status_col] == done_str).sum()
-revised_count = (filtered[status_col] == revised_str).sum()
-reject_count = (filtered[status_col] == reject_str).sum()
-total = len(filtered)
-
-# --- Calculate percentages
-qa_done_pr = (done_count / total * 100) if total else 0
-done_revised_pr = (revised_count / total * 100) if total else 0
-reject_pr = (reject_count / total * 100) if total else 0
-
-
-done_counts = (
-    filtered[filtered[status_col] == done_str][qa_col]
-    .value_counts().rename("Done Count")
-)
-
-reject_counts = (
-    filtered[filtered[status_col] == reject_str][qa_col]
-    .value_counts().rename("Reject Count")
-)
-
-revised_counts = (
-    filtered[filtered[status_col] == revised_str][qa_col]
-    .value_counts().rename("Revised Count")
-)
-
-qa_summary = pd.concat([done_counts, reject_counts, revised_counts], axis=1).fillna(0).reset_index()
-qa_summary.rename(columns={"index": "QA Name"}, inplace=True)
-
-qa_summary['Total'] = qa_summary['Done Count'] + qa_summary['Reject Count'] + qa_summary['Revised Count']
-qa_summary['Rejection Rate (%)'] = np.where(
-    qa_summary['Total'] > 0,
-    (qa_summary['Reject Count'] / qa_summary['Total']) * 100,
-    0.0
-).round(1)
-
-qa_summary = qa_summary.sort_values(by='Total', ascending=True)
-
-
-# --- Now you can build the 4 KPI cards ---
+# --- Section styles: injected once per full run, not on month reruns ---
 # Define your colors
 CARD_BG = "#f9f9f9"
 ACCENT_COLOR_DONE = "#28a745"     # Green
@@ -317,12 +327,8 @@ st.markdown("""
         }
     </style>
 """, unsafe_allow_html=True)
-# KPI layout
-month_date = datetime.strptime(selected_month, "%Y-%m")
-pretty_month = month_date.strftime("%B - %Y")
-st.subheader(f"📅 Monthly Overview for **{pretty_month}**")
-k1, k2, k3, k4 = st.columns(4)
 
+# ✅ Spotlight KPI card CSS
 st.markdown(f"""
 <style>
   .spotlight-card {{
@@ -428,788 +434,662 @@ st.markdown(f"""
 </style>
 """, unsafe_allow_html=True)
 
+# ✅ Hover card & General CSS Styles
+st.markdown("""
+    <style>
+        /* General Streamlit tweaks for a cleaner look */
+        .stContainer, .st-emotion-cache-1pxn41c {
+            gap: 1rem; /* Better spacing between rows */
+        }
 
-with k1:
-    st.markdown(f"""
-        <div class="spotlight-card spotlight-total">
-            <h4 class="spotlight-title">📊 Total Files ({selected_dept})</h4>
-            <h2 class="spotlight-value">{total}</h2>
-        </div>
-    """, unsafe_allow_html=True)
+        /* Hover Card Effect */
+        .hover-card {
+            box-shadow: 0 2px 8px rgba(0,0,0,0.08); /* Initial subtle shadow */
+            border: 1px solid rgba(0,0,0,0.05); /* Soft border */
+            transition: all 0.3s ease-in-out;
+        }
+        .hover-card:hover {
+            box-shadow: 4px 6px 20px rgba(0,0,0,0.15);
+            transform: scale(1.02);
+        }
 
-with k2:
-    st.markdown(f"""
-        <div class="spotlight-card spotlight-done">
-            <h4 class="spotlight-title">{selected_dept} Done ✅</h4>
-            <h2 class="spotlight-value">
-                {done_count}
-                <span class="spotlight-subvalue">({qa_done_pr:.1f}%)</span>
-            </h2>
-        </div>
-    """, unsafe_allow_html=True)
+        /* Consistent List Styling for better alignment */
+        .hover-card ul {
+            padding-left: 20px;
+            margin-top: 5px; /* Reduce margin above list */
+            margin-bottom: 5px; /* Reduce margin below list */
+            font-size: 15px; /* Slightly smaller font for points */
+        }
+        .hover-card ul li {
+            margin-bottom: 5px;
+        }
+
+        /* Consistent Header Styling */
+        .hover-card h4 {
+            margin-top: 0;
+            padding-bottom: 5px;
+            border-bottom: 1px solid rgba(0,0,0,0.1);
+        }
+    </style>
+""", unsafe_allow_html=True)
+
+
+# --- Profiling breakdown (only with ?profile=1) ---
+def profiling_panel():
+    """Stop the profiler and show this run's breakdown: after the last section of
+    the page, or at the end of a fragment when only that fragment reran."""
+    profiler.stop()
+    if not profiler.enabled:
+        return
+    with st.expander("⏱️ Profiling: this run", expanded=True):
+        st.markdown("**Page sections** (chart serialisation is counted in the section that draws the chart)")
+        st.dataframe(profiler.sections_frame(), use_container_width=True, hide_index=True)
+        st.markdown("**Caches**")
+        st.dataframe(profiler.caches_frame(), use_container_width=True, hide_index=True)
+        loaded_ago = time.time() - sheet.loaded_at
+        st.markdown(f"**Last sheet load** (background thread, {loaded_ago:.0f} s ago, data version `{data_version[:12]}`)")
+        st.dataframe(
+            pd.DataFrame({"Step": list(sheet.timings), "Time (ms)": [v * 1000 for v in sheet.timings.values()]}).round(2),
+            use_container_width=True, hide_index=True,
+        )
+
+
+# Set once the whole page has run; a fragment that reruns on its own later shows its own panel.
+fragment_rerun = False
+
+
+# --- Month sections: a fragment, so changing the month reruns only this part ---
+@st.fragment
+def month_sections(cube, data_version, selected_dept, available_months):
+    month_analysis(cube, data_version, selected_dept, available_months)
+    if fragment_rerun:
+        profiling_panel()
+
+
+def month_analysis(cube, data_version, selected_dept, available_months):
+    # --- Month Selector ---
+    profiler.lap("Month selector")
+    col1, col2 = st.columns([0.2, 0.8])
+    with col1:
+        selected_month = st.selectbox(
+            "Select a Month",
+            options=available_months,
+            index=len(available_months) - 1
+        )
+
+    # --- Every number below comes from one report on the month ---
+    profiler.lap("Month report")
+    report = profiler.cached("load_report", load_report, cube, data_version, selected_dept, selected_month)
+    figures = profiler.cached("month_figures", month_figures, report, selected_dept, selected_month, data_version)
+    kpis = report["kpis"]
+    # --- Stop if no data
+    if kpis["total"] == 0:
+        st.info(f"No QA records found for **{selected_month}** in the {selected_dept} department.")
+        return
+
+    # --- Count each status ---
+    done_count = kpis["done"]
+    revised_count = kpis["revised"]
+    reject_count = kpis["reject"]
+    total = kpis["total"]
+
+    # --- Calculate percentages
+    qa_done_pr = kpis["done_pct"]
+    done_revised_pr = kpis["revised_pct"]
+    reject_pr = kpis["reject_pct"]
+
+    qa_summary = report["qa_summary"]
+
+
+    # --- Now you can build the 4 KPI cards ---
+    profiler.lap("KPI cards")
+    # KPI layout
+    month_date = datetime.strptime(selected_month, "%Y-%m")
+    pretty_month = month_date.strftime("%B - %Y")
+    st.subheader(f"📅 Monthly Overview for **{pretty_month}**")
+    k1, k2, k3, k4 = st.columns(4)
+
+
+
+    with k1:
+        st.markdown(f"""
+            <div class="spotlight-card spotlight-total">
+                <h4 class="spotlight-title">📊 Total Files ({selected_dept})</h4>
+                <h2 class="spotlight-value">{total}</h2>
+            </div>
+        """, unsafe_allow_html=True)
+
+    with k2:
+        st.markdown(f"""
+            <div class="spotlight-card spotlight-done">
+                <h4 class="spotlight-title">{selected_dept} Done ✅</h4>
+                <h2 class="spotlight-value">
+                    {done_count}
+                    <span class="spotlight-subvalue">({qa_done_pr:.1f}%)</span>
+                </h2>
+            </div>
+        """, unsafe_allow_html=True)
+
+    with k3:
+        st.markdown(f"""
+            <div class="spotlight-card spotlight-reject">
+                <h4 class="spotlight-title">Rejected ❌</h4>
+                <h2 class="spotlight-value">
+                    {reject_count}
+                    <span class="spotlight-subvalue">({reject_pr:.1f}%)</span>
+                </h2>
+            </div>
+        """, unsafe_allow_html=True)
+
+    with k4:
+        st.markdown(f"""
+            <div class="spotlight-card spotlight-revised">
+                <h4 class="spotlight-title">Done/Revised 📝</h4>
+                <h2 class="spotlight-value">
+                    {revised_count}
+                    <span class="spotlight-subvalue">({done_revised_pr:.1f}%)</span>
+                </h2>
+            </div>
+        """, unsafe_allow_html=True)
 
-with k3:
-    st.markdown(f"""
-        <div class="spotlight-card spotlight-reject">
-            <h4 class="spotlight-title">Rejected ❌</h4>
-            <h2 class="spotlight-value">
-                {reject_count}
-                <span class="spotlight-subvalue">({reject_pr:.1f}%)</span>
-            </h2>
-        </div>
-    """, unsafe_allow_html=True)
 
-with k4:
+    st.markdown("---")
+
+
+
+    # 📅 Daily QA Files Trend
+    profiler.lap("Daily trend chart")
+    st.markdown(f"#### 📅 Daily {selected_dept} Files Trend")
+
+    daily_counts = report["daily_counts"]
+
+    fig_daily = figures["daily_trend"]
+    st.plotly_chart(fig_daily, use_container_width=True)
+
+    # Summary and Preventive Actions
+    left_spacer, content_col, right_spacer = st.columns([1, 2, 1])
+    with content_col:
+        col1, col2 = st.columns(2)
+
+        with col1:
+            if not daily_counts.empty:
+                max_date = daily_counts.loc[daily_counts["File Count"].idxmax(), "QA Status Date Only"]
+                total_files = total
+                avg_files = daily_counts["File Count"].mean()
+            else:
+                max_date = "N/A"
+                total_files = 0
+                avg_files = 0.0
+
+            st.markdown(f"""
+                <style>
+                    .hover-card:hover {{
+                        box-shadow: 4px 6px 20px rgba(0,0,0,0.15);
+                        transform: scale(1.02);
+                        transition: all 0.3s ease-in-out;
+                    }}
+                </style>
+                <div class='hover-card' style='
+                    background-color: #e8f0fe;
+                    padding: 20px;
+                    border-radius: 10px;
+                    box-shadow: 2px 2px 8px rgba(0,0,0,0.05);
+                    transition: all 0.3s ease-in-out;
+                '>
+                <h4 style='color: #290660;'>📋 Graph Summary</h4>
+                <ul style='color: #333; font-size: 16px;'>
+                    <li>Highest {selected_dept} file count on <strong>{max_date}</strong></li>
+                    <li>Total {selected_dept} files: <strong>{total_files}</strong></li>
+                    <li>Average per day: <strong>{avg_files:.1f}</strong></li>
+                </ul>
+                </div>
+            """, unsafe_allow_html=True)
+
+        with col2:
+            st.markdown(f"""
+                <div class='hover-card' style='
+                    background-color: #fef3c7;
+                    padding: 20px;
+                    border-radius: 10px;
+                    box-shadow: 2px 2px 8px rgba(0,0,0,0.05);
+                    transition: all 0.3s ease-in-out;
+                '>
+                <h4 style='color: #290660;'>🛡️ Preventive Action</h4>
+                <ul style='color: #333; font-size: 16px;'>
+                    <li>Monitor {selected_dept} workload spikes to avoid overload</li>
+                    <li>Cross-train {selected_dept} to handle peak days</li>
+                    <li>Review rejected files for recurring issues</li>
+                </ul>
+                </div>
+            """, unsafe_allow_html=True)
+
+    st.markdown("---")
+
+    # 📊 New Chart: Daily Count of Done vs Rejected (Side-by-Side with Counts)
+    profiler.lap("Done vs Rejected chart")
     st.markdown(f"""
-        <div class="spotlight-card spotlight-revised">
-            <h4 class="spotlight-title">Done/Revised 📝</h4>
-            <h2 class="spotlight-value">
-                {revised_count}
-                <span class="spotlight-subvalue">({done_revised_pr:.1f}%)</span>
-            </h2>
+        <div style='background-color: #e0e7ff; padding: 10px 15px; border-radius: 8px; 
+                    margin-bottom: 10px; box-shadow: 0 4px 8px rgba(0,0,0,0.08);
+                    transition: all 0.5s ease-in-out;'>
+            <h5 style='margin: 0; color: #290660; font-weight: 600;'>
+                🗓️ Daily {selected_dept} Status Breakdown (Done vs Rejected)
+            </h5>
         </div>
     """, unsafe_allow_html=True)
 
 
-st.markdown("---")
+    # Prepare data (only for selected QA Status Month), with the Average line
+    pivot_daily = report["daily_status"]
+    # Calculate totals for donut chart
+    total_done = pivot_daily[done_str].sum()
+    total_rejected = pivot_daily[reject_str].sum()
+    avg_total = pivot_daily["Average"].sum()
+
+    fig_group = figures["daily_status"]
+
+    # Streamlit display
+    st.plotly_chart(fig_group, use_container_width=True)
+
+
+    # 📊 Summary and Action Points for Done vs Rejected Chart
+    left_spacer2, content_col2, right_spacer2 = st.columns([1, 2, 1])
+    with content_col2:
+        col3, col4 = st.columns(2)
+
+        with col3:
+            if not pivot_daily.empty:
+                max_done_date = pivot_daily[done_str].idxmax()
+                max_reject_date = pivot_daily[reject_str].idxmax()
+                total_done = done_count
+                total_rejected = revised_count
+            else:
+                max_done_date = "N/A"
+                max_reject_date = "N/A"
+                total_done = 0
+                total_rejected = 0
+
+            st.markdown(f"""
+                <div class='hover-card' style='
+                    background-color: #d1fae5;
+                    padding: 20px;
+                    border-radius: 10px;
+                    box-shadow: 2px 2px 8px rgba(0,0,0,0.05);
+                    transition: all 0.3s ease-in-out;
+                '>
+                <h4 style='color: #065f46;'>📈 Done vs Rejected Summary</h4>
+                <ul style='color: #333; font-size: 16px;'>
+                    <li>Most FTR on: <strong>{max_done_date}</strong></li>
+                    <li>Most Rejections on: <strong>{max_reject_date}</strong></li>
+                    <li>Total FTR: <strong>{total_done}</strong></li>
+                    <li>Total Rejected: <strong>{total_rejected}</strong></li>
+                </ul>
+                </div>
+            """, unsafe_allow_html=True)
+
+        with col4:
+            st.markdown(f"""
+                <div class='hover-card' style='
+                    background-color: #fee2e2;
+                    padding: 20px;
+                    border-radius: 10px;
+                    box-shadow: 2px 2px 8px rgba(0,0,0,0.05);
+                    transition: all 0.3s ease-in-out;
+                '>
+                <h4 style='color: #7f1d1d;'>⚠️ Suggested Actions</h4>
+                <ul style='color: #333; font-size: 16px;'>
+                    <li>Investigate high rejection days</li>
+                    <li>Compare rejection reasons with {selected_dept} logs</li>
+                    <li>Provide feedback to reduce repeated mistakes</li>
+                </ul>
+                </div>
+            """, unsafe_allow_html=True)
 
+    st.markdown("---")
 
 
-# 📅 Daily QA Files Trend
-st.markdown(f"#### 📅 Daily {selected_dept} Files Trend")
 
-filtered[qa_status_date_col] = pd.to_datetime(filtered[qa_status_date_col], errors='coerce')
-filtered = filtered.dropna(subset=[qa_status_date_col]).copy()
-filtered["QA Status Date Only"] = filtered[qa_status_date_col].dt.date
-filtered["QA Status Month"] = filtered[qa_status_date_col].dt.to_period("M").astype(str)
-filtered_month_only = filtered[filtered["QA Status Month"] == selected_month]
+    # Create a 2-column layout
+    profiler.lap("Status donut & QA-wise chart")
+    col1, col2 = st.columns([0.35, 0.65])
 
-daily_counts = (
-    filtered_month_only
-    .groupby("QA Status Date Only")
-    .size()
-    .reset_index(name='File Count')
-)
+    # === 📊 Section headers: donut (left), QA-wise summary (right) ===
+    with col1:
+        st.markdown(f"""
+            <div style='background-color: #e0e7ff; padding: 5px 8px; border-radius: 8px; margin-bottom: 5px;'>
+                <h5 style='margin: 0; color: #1e3a8a;'> 🎯 {selected_dept} Status Distribution</h5>
+            </div>
+        """, unsafe_allow_html=True)
 
-fig_daily = px.bar(
-    daily_counts,
-    x="QA Status Date Only",
-    y="File Count",
-    color="File Count",
-    color_continuous_scale="Blues",
-    text="File Count",
-    labels={"QA Status Date Only": "Date", "File Count": "Number of Files"},
-    title=""
-)
+    with col2:
+        st.markdown(f"""
+            <div style='background-color: #e0f7fa; padding: 5px 8px;border-radius: 8px; margin-bottom: 5px;'>
+                <h5 style='margin: 0; color: #006064;'> 🧑‍💻 {selected_dept}-wise Work Summary</h5>
+            </div>
+        """, unsafe_allow_html=True)
 
-fig_daily.update_layout(
-    height=400,
-    xaxis=dict(
-        tickangle=-45,
-        tickformat="%b %d",  # Example: Oct 01
-        dtick="D1",  # Show every day (1-day interval)
-        tickfont=dict(size=10)
-    ),
-    margin=dict(t=30, b=50, l=30, r=30),
-    showlegend=False,
-    coloraxis_showscale=False
-)
+    # === Ranking and paging for the QA-wise chart; only the visible page is sent ===
+    pages = max(1, -(-len(qa_summary) // qa_page_size))
+    _, rank_col, page_col = st.columns([0.35, 0.4, 0.25])
+    with rank_col:
+        rank_by = st.selectbox(f"Rank {selected_dept} members by", options=qa_rank_cols, index=0)
+    with page_col:
+        page = st.selectbox(f"Page (of {pages})", options=range(1, pages + 1), index=0, disabled=pages == 1)
+    qa_rows, qa_others, _ = qa_page(qa_summary, rank_by, page - 1)
+
+    # === 📊 Both Highcharts views in one component; only their data is sent ===
+    clicked = qa_charts(selected_dept, kpis, qa_rows, qa_others)
+
+    # --- Details for the QA whose bar was clicked last (if still in this month) ---
+    clicked_row = qa_summary[qa_summary[qa_col] == clicked["qa"]] if clicked else qa_summary.iloc[0:0]
+    if not clicked_row.empty:
+        row = clicked_row.iloc[0]
+        st.markdown(f"""
+            <div class='hover-card' style='background-color: #e0f7fa; padding: 12px 20px; border-radius: 10px;'>
+                🔎 <strong>{row[qa_col]}</strong> —
+                Done: <strong>{row['Done Count']}</strong> ·
+                Rejected: <strong>{row['Reject Count']}</strong> ·
+                Revised: <strong>{row['Revised Count']}</strong> ·
+                Rejection Rate: <strong>{row['Rejection Rate (%)']:.1f}%</strong>
+            </div>
+        """, unsafe_allow_html=True)
 
-fig_daily.update_traces(textposition='outside')
-st.plotly_chart(fig_daily, use_container_width=True)
 
-# Summary and Preventive Actions
-left_spacer, content_col, right_spacer = st.columns([1, 2, 1])
-with content_col:
-    col1, col2 = st.columns(2)
 
-    with col1:
-        if not daily_counts.empty:
-            max_date = daily_counts.loc[daily_counts["File Count"].idxmax(), "QA Status Date Only"]
-            total_files = total
-            avg_files = daily_counts["File Count"].mean()
-        else:
-            max_date = "N/A"
-            total_files = 0
-            avg_files = 0.0
+
+
+
+    # Use a slightly more robust check for division
+    if total_files > 0:
+        done_pct = qa_done_pr
+        reject_pct = reject_pr
+        revised_pct = done_revised_pr
+    else:
+        done_pct = reject_pct = revised_pct = 0
+
+    rework_pct = reject_pct + revised_pct
+
+    # ---------------- ROW 1 (The 3 main metrics) ----------------
+    profiler.lap("Status breakdown cards")
+    st.subheader(f"{selected_dept} File Status Breakdown")
+    row1_col1, row1_col2, row1_col3 = st.columns(3)
+
+    # 🟦 Card: QA Done
+    with row1_col1:
+        left_points = ["Files passed in first iteration.", "Clean implementation.", "SOW understood."]
+        # The original logic for splitting points is fine, but for simplicity with 3 points, we'll keep it simple.
+        # The points can be displayed in a single column for this small list.
 
         st.markdown(f"""
-            <style>
-                .hover-card:hover {{
-                    box-shadow: 4px 6px 20px rgba(0,0,0,0.15);
-                    transform: scale(1.02);
-                    transition: all 0.3s ease-in-out;
-                }}
-            </style>
             <div class='hover-card' style='
-                background-color: #e8f0fe;
+                background-color: #e0f7fa; /* Light Cyan */
                 padding: 20px;
                 border-radius: 10px;
-                box-shadow: 2px 2px 8px rgba(0,0,0,0.05);
-                transition: all 0.3s ease-in-out;
+                color: #000;
             '>
-            <h4 style='color: #290660;'>📋 Graph Summary</h4>
-            <ul style='color: #333; font-size: 16px;'>
-                <li>Highest {selected_dept} file count on <strong>{max_date}</strong></li>
-                <li>Total {selected_dept} files: <strong>{total_files}</strong></li>
-                <li>Average per day: <strong>{avg_files:.1f}</strong></li>
-            </ul>
+            <h4 style='color: #004d40;'>✅ {selected_dept} Done - {done_count:,} files ({done_pct:.1f}%)</h4>
+            <div style="display: flex;">
+                <ul style='flex: 1;'>{''.join(f'<li>{pt}</li>' for pt in left_points)}</ul>
             </div>
+        </div>
         """, unsafe_allow_html=True)
 
-    with col2:
+    # 🟥 Card: QA Rejected
+    with row1_col2:
+        left_points = ["Wrong platform logic", "Missing data points", "SOW mismatch"]
+        # Removed the complex `right_points` logic for visual simplicity in the card.
+
         st.markdown(f"""
             <div class='hover-card' style='
-                background-color: #fef3c7;
+                background-color: #ffebee; /* Light Red */
                 padding: 20px;
                 border-radius: 10px;
-                box-shadow: 2px 2px 8px rgba(0,0,0,0.05);
-                transition: all 0.3s ease-in-out;
+                color: #000;
             '>
-            <h4 style='color: #290660;'>🛡️ Preventive Action</h4>
-            <ul style='color: #333; font-size: 16px;'>
-                <li>Monitor {selected_dept} workload spikes to avoid overload</li>
-                <li>Cross-train {selected_dept} to handle peak days</li>
-                <li>Review rejected files for recurring issues</li>
-            </ul>
+            <h4 style='color: #b71c1c;'>❌ {selected_dept} Rejected - {reject_count:,} files ({reject_pct:.1f}%)</h4>
+            <div style="display: flex;">
+                <ul style='flex: 1;'>
+                    {''.join(f"<li>{point}</li>" for point in left_points)}
+                </ul>
+            </div>
             </div>
         """, unsafe_allow_html=True)
 
-st.markdown("---")
-
-# 📊 New Chart: Daily Count of Done vs Rejected (Side-by-Side with Counts)
-st.markdown(f"""
-    <div style='background-color: #e0e7ff; padding: 10px 15px; border-radius: 8px; 
-                margin-bottom: 10px; box-shadow: 0 4px 8px rgba(0,0,0,0.08);
-                transition: all 0.5s ease-in-out;'>
-        <h5 style='margin: 0; color: #290660; font-weight: 600;'>
-            🗓️ Daily {selected_dept} Status Breakdown (Done vs Rejected)
-        </h5>
-    </div>
-""", unsafe_allow_html=True)
-
-
-# Define custom colors
-CARD_BG = "rgba(255, 255, 255, 255)"
-PLOT_BG = "#e6f0ff"
-DEEP_VIOLET = "#290660"
-DONE_COLOR = "#0d6efd"
-REJECTED_COLOR = "#ff5733"
-AVG_COLOR = "#9b59b6"  # Purple line for Average
-
-# Prepare data (only for selected QA Status Month)
-daily_status_breakdown = (
-    filtered_month_only
-    .groupby(["QA Status Date Only", status_col])
-    .size()
-    .reset_index(name="Count")
-)
-
-# Filter relevant statuses
-daily_status_breakdown = daily_status_breakdown[
-    daily_status_breakdown[status_col].isin([done_str, reject_str])
-]
-
-# Pivot for plotting
-pivot_daily = daily_status_breakdown.pivot(
-    index="QA Status Date Only",
-    columns=status_col,
-    values="Count"
-).fillna(0)
-
-# Ensure expected columns
-for col in [done_str, reject_str]:
-    if col not in pivot_daily.columns:
-        pivot_daily[col] = 0
-
-# ✅ Calculate Average line
-pivot_daily["Average"] = pivot_daily.mean(axis=1)
-# Calculate totals for donut chart
-total_done = pivot_daily[done_str].sum()
-total_rejected = pivot_daily[reject_str].sum()
-avg_total = pivot_daily["Average"].sum()
-
-fig_group = go.Figure()
-
-# FTR bar
-fig_group.add_trace(go.Bar(
-    x=pivot_daily.index,
-    y=pivot_daily[done_str],
-    name="FTR",
-    marker_color=DONE_COLOR,
-    text=pivot_daily[done_str],
-    textposition='outside',
-    hovertemplate='Date: %{x}<br>FTR: %{y}<extra></extra>'
-))
-
-# Iteration Count bar
-fig_group.add_trace(go.Bar(
-    x=pivot_daily.index,
-    y=pivot_daily[reject_str],
-    name="Iteration count",
-    marker_color=REJECTED_COLOR,
-    text=pivot_daily[reject_str],
-    textposition='outside',
-    hovertemplate='Date: %{x}<br>Iteration: %{y}<extra></extra>'
-))
-
-# Average line
-fig_group.add_trace(go.Scatter(
-    x=pivot_daily.index,
-    y=pivot_daily["Average"],
-    mode="lines+markers",
-    name="Average",
-    line=dict(color=AVG_COLOR, width=3, shape="spline"),
-    marker=dict(size=8, color="white", line=dict(width=2, color=AVG_COLOR)),
-    hovertemplate='Date: %{x}<br>Average: %{y:.1f}<extra></extra>'
-))
-
-
-
-# Layout for combined chart
-fig_group.update_layout(
-    barmode='group',
-    xaxis_title="Date",
-    yaxis_title="File Count",
-    plot_bgcolor=PLOT_BG,
-    paper_bgcolor=CARD_BG,
-    height=420,
-    xaxis=dict(
-        tickangle=-45,
-        tickformat="%b %d",
-        dtick="D1",
-        tickfont=dict(size=10),
-        showgrid=True,
-        gridcolor='#f0f0f0'
-    ),
-    yaxis=dict(
-        showgrid=True,
-        gridcolor='#f0f0f0'
-    ),
-    legend=dict(
-        orientation="v",
-        yanchor="top",
-        y=1,
-        xanchor="left",
-        x=1.02,
-        font=dict(color=DEEP_VIOLET),
-        bgcolor="rgba(255,255,255,0)"
-    ),
-    margin=dict(t=40, r=100, b=50, l=50),  # increased right margin to make space for donut
-    uniformtext_minsize=8,
-    uniformtext_mode='show'
-)
+    # 🟧 Card: QA Revised
+    with row1_col3:
+        left_points = ["Files resubmitted after correction.", "Revalidation impacts FTR.", "Second review required."]
+        # Removed the complex `right_points` logic for visual simplicity in the card.
 
-# Streamlit display
-st.plotly_chart(fig_group, use_container_width=True)
+        st.markdown(f"""
+            <div class='hover-card' style='
+                background-color: #fff3e0; /* Light Orange */
+                padding: 20px;
+                border-radius: 10px;
+                color: #000;
+            '>
+            <h4 style='color: #e65100;'>🔄 {selected_dept} Revised - {revised_count:,} files ({revised_pct:.1f}%)</h4>
+            <div style="display: flex;">
+                <ul style='flex: 1;'>
+                    {''.join(f"<li>{point}</li>" for point in left_points)}
+                </ul>
+            </div>
+            </div>
+        """, unsafe_allow_html=True)
 
 
-# 📊 Summary and Action Points for Done vs Rejected Chart
-left_spacer2, content_col2, right_spacer2 = st.columns([1, 2, 1])
-with content_col2:
-    col3, col4 = st.columns(2)
+    # ---------------- ROW 2 (Summary and Action Points) ----------------
 
-    with col3:
-        if not pivot_daily.empty:
-            max_done_date = pivot_daily[done_str].idxmax()
-            max_reject_date = pivot_daily[reject_str].idxmax()
-            total_done = done_count
-            total_rejected = revised_count
-        else:
-            max_done_date = "N/A"
-            max_reject_date = "N/A"
-            total_done = 0
-            total_rejected = 0
+    # Using st.columns(2) directly for cleaner code structure without an outer container
+    row2_col1, row2_col2 = st.columns(2)
 
+    # 🧠 Card Part 1: FTR % and Rework %
+    with row2_col1:
+        ftr_pct = done_pct
         st.markdown(f"""
             <div class='hover-card' style='
-                background-color: #d1fae5;
+                background-color: #f3e5f5;
                 padding: 20px;
                 border-radius: 10px;
-                box-shadow: 2px 2px 8px rgba(0,0,0,0.05);
-                transition: all 0.3s ease-in-out;
+                margin-top: 25px;
             '>
-            <h4 style='color: #065f46;'>📈 Done vs Rejected Summary</h4>
-            <ul style='color: #333; font-size: 16px;'>
-                <li>Most FTR on: <strong>{max_done_date}</strong></li>
-                <li>Most Rejections on: <strong>{max_reject_date}</strong></li>
-                <li>Total FTR: <strong>{total_done}</strong></li>
-                <li>Total Rejected: <strong>{total_rejected}</strong></li>
+            <h4 style='color: #4a148c;'>📌 Key Performance Indicators</h4>
+            <ul style='color: #333;'>
+                <li><strong>First Time Right (FTR):</strong> <span style='font-size: 18px; color: #004d40;'>{ftr_pct:.1f}%</span></li>
+                <li><strong>Rework Required:</strong> <span style='font-size: 18px; color: #b71c1c;'>{rework_pct:.1f}%</span></li>
+                <li><strong>Total Files Reviewed:</strong> <span style='font-size: 18px;'>{total_files:,}</span></li>
             </ul>
             </div>
         """, unsafe_allow_html=True)
 
-    with col4:
+    # 🛠️ Card Part 2: Developer Action Points
+    with row2_col2:
         st.markdown(f"""
             <div class='hover-card' style='
-                background-color: #fee2e2;
+                background-color: #f3e5f5;
                 padding: 20px;
                 border-radius: 10px;
-                box-shadow: 2px 2px 8px rgba(0,0,0,0.05);
-                transition: all 0.3s ease-in-out;
+                margin-top: 25px;
             '>
-            <h4 style='color: #7f1d1d;'>⚠️ Suggested Actions</h4>
-            <ul style='color: #333; font-size: 16px;'>
-                <li>Investigate high rejection days</li>
-                <li>Compare rejection reasons with {selected_dept} logs</li>
-                <li>Provide feedback to reduce repeated mistakes</li>
+            <h4 style='color: #4a148c;'>🛠️ Action Plan & Focus Areas</h4>
+            <ul style='color: #333;'>
+                <li><strong>SOW Alignment:</strong> Clarify complex or ambiguous Statement of Work expectations.</li>
+                <li><strong>Root Cause Analysis:</strong> Investigate recurring "Rejected" issues with development team.</li>
+                <li><strong>Pre-{selected_dept} Checks:</strong> Implement developer-side validation steps to catch basic errors.</li>
             </ul>
             </div>
         """, unsafe_allow_html=True)
 
-st.markdown("---")
-
-
-
-# Create a 2-column layout
-col1, col2 = st.columns([0.35, 0.65])
-
-# === 📊 PART 1 — Donut Chart (Left Side) ===
-with col1:
-    st.markdown(f"""
-        <div style='background-color: #e0e7ff; padding: 5px 8px; border-radius: 8px; margin-bottom: 5px;'>
-            <h5 style='margin: 0; color: #1e3a8a;'> 🎯 {selected_dept} Status Distribution</h5>
-        </div>
-    """, unsafe_allow_html=True)
-
-    highcharts_code = f"""
-    <div id="container" style="height: 400px; width: 100%;"></div>
-    <script src="https://code.highcharts.com/highcharts.js"></script>
-    <script src="https://code.highcharts.com/highcharts-3d.js"></script>
-    <script>
-    Highcharts.chart('container', {{
-        chart: {{
-            type: 'pie',
-            backgroundColor: '#f8f9fc',
-            options3d: {{
-                enabled: true,
-                alpha: 45,
-                beta: 0
-            }}
-        }},
-        title: {{
-            text: ''
-        }},
-        tooltip: {{
-            pointFormat: '{{series.name}}: <b>{{point.y}}</b>'
-        }},
-        plotOptions: {{
-            pie: {{
-                allowPointSelect: true,
-                cursor: 'pointer',
-                depth: 45,
-                innerSize: 100,
-                dataLabels: {{
-                    enabled: true,
-                    format: '{{point.name}}: {{point.y}}'
-                }}
-            }}
-        }},
-        series: [{{
-            name: 'Files',
-            data: [
-                {{ name: 'Done', y: {done_count}, color: '#28a745' }},
-                {{ name: 'Reject', y: {reject_count}, color: '#dc3545' }},
-                {{ name: '{selected_dept} Done/Revised', y: {revised_count}, color: '#ffc107' }}
-            ]
-        }}]
-    }});
-    </script>
-    """
-
-    components.html(highcharts_code, height=450)
-
-
-# === 📊 PART 2 — QA-wise Summary Bar Chart (Right Side) ===
-with col2:
-    st.markdown(f"""
-        <div style='background-color: #e0f7fa; padding: 5px 8px;border-radius: 8px; margin-bottom: 5px;'>
-            <h5 style='margin: 0; color: #006064;'> 🧑‍💻 {selected_dept}-wise Work Summary</h5>
-        </div>
-    """, unsafe_allow_html=True)
-
-    if not qa_summary.empty:
-        # Prepare dynamic values
-        qa_names = qa_summary['QA Name'].tolist()
-        done_data = qa_summary['Done Count'].tolist()
-        reject_data = qa_summary['Reject Count'].tolist()
-
-        # Convert Python lists to JavaScript array format
-        js_categories = json.dumps(qa_names)
-        js_done = json.dumps(done_data)
-        js_reject = json.dumps(reject_data)
-
-        highcharts_code = f"""
-        <div id="container" style="height: 450px; width: 100%;"></div>
-        <script src="https://code.highcharts.com/highcharts.js"></script>
-        <script src="https://code.highcharts.com/modules/exporting.js"></script>
-        <script>
-        Highcharts.chart('container', {{
-            chart: {{
-                type: 'bar',
-                backgroundColor: '#f9f9fc'
-            }},
-            title: {{
-                text: '',
-                align: 'left'
-            }},
-            xAxis: {{
-                categories: {js_categories},
-                title: {{
-                    text: null
-                }},
-                labels: {{
-                    style: {{
-                        fontSize: '13px'
-                    }}
-                }}
-            }},
-            yAxis: {{
-                min: 0,
-                title: {{
-                    text: 'Count of Files',
-                    align: 'high'
-                }},
-                labels: {{
-                    overflow: 'justify'
-                }}
-            }},
-            tooltip: {{
-                valueSuffix: ' files'
-            }},
-            plotOptions: {{
-                bar: {{
-                 pointWidth: 20,  
-                 groupPadding: 0.2, // gap between groups of bars (like "Done" and "Reject")
-                 pointPadding: 0.1,
-                    dataLabels: {{
-                        enabled: true
-                    }}
-                    
-                }},
-                series: {{
-                    stacking: 'normal'
-                }}
-            }},
-            legend: {{
-                    enabled: false
-                }},
-
-            credits: {{
-                enabled: false
-            }},
-            series: [{{
-                name: 'Reject',
-                data: {js_reject},
-                color: '#dc3545'
-            }}, {{
-                name: 'Done',
-                data: {js_done},
-                color: '#28a745'
-            }}]
-        }});
-        </script>
-        """
-
-        components.html(highcharts_code, height=500)
-    else:
-        st.info("No individual QA activity found for this month.")
+    st.markdown("---")
 
 
+    # --- 🧮 Frequency-wise Done/Reject counts, FTR%, Iteration% and volume comment ---
+    profiler.lap("Frequency table & chart")
+    summary = report["frequency_summary"]
 
+    # --- ✨ Final formatted table, with a Total footer row ---
+    summary_table = frequency_table(summary)
 
+    # Apply background color
+    styled_table = summary_table.style.set_properties(**{
+        'background-color': '#f0f8ff',  # light blue
+        'color': 'black',
+        'border-color': 'black'
+    })
 
+    # --- 🎨 Layout: Table (left) + Chart (right)
+    col1, col2 = st.columns([1, 1])
 
-# Use a slightly more robust check for division
-if total_files > 0:
-    done_pct = qa_done_pr
-    reject_pct = reject_pr
-    revised_pct = done_revised_pr
-else:
-    done_pct = reject_pct = revised_pct = 0
+    # --- LEFT: Table ---
+    with col1:
+        st.markdown("### 📋 Frequency Summary Table")
+        table_height = int(38 * len(summary_table))  # approximate row height
+        st.dataframe(styled_table, height=table_height)
 
-rework_pct = reject_pct + revised_pct
 
-# ✅ Hover card & General CSS Styles
-st.markdown("""
-    <style>
-        /* General Streamlit tweaks for a cleaner look */
-        .stContainer, .st-emotion-cache-1pxn41c {
-            gap: 1rem; /* Better spacing between rows */
-        }
 
-        /* Hover Card Effect */
-        .hover-card {
-            box-shadow: 0 2px 8px rgba(0,0,0,0.08); /* Initial subtle shadow */
-            border: 1px solid rgba(0,0,0,0.05); /* Soft border */
-            transition: all 0.3s ease-in-out;
-        }
-        .hover-card:hover {
-            box-shadow: 4px 6px 20px rgba(0,0,0,0.15);
-            transform: scale(1.02);
-        }
+    # --- RIGHT: Bar Chart ---
+    with col2:
+        st.markdown("### 📊 FTR% vs Iteration% by Frequency")
 
-        /* Consistent List Styling for better alignment */
-        .hover-card ul {
-            padding-left: 20px;
-            margin-top: 5px; /* Reduce margin above list */
-            margin-bottom: 5px; /* Reduce margin below list */
-            font-size: 15px; /* Slightly smaller font for points */
-        }
-        .hover-card ul li {
-            margin-bottom: 5px;
-        }
+        fig = figures["frequency"]
 
-        /* Consistent Header Styling */
-        .hover-card h4 {
-            margin-top: 0;
-            padding-bottom: 5px;
-            border-bottom: 1px solid rgba(0,0,0,0.1);
-        }
-    </style>
-""", unsafe_allow_html=True)
+        st.plotly_chart(fig, use_container_width=True)
 
-# ---------------- ROW 1 (The 3 main metrics) ----------------
-st.subheader(f"{selected_dept} File Status Breakdown")
-row1_col1, row1_col2, row1_col3 = st.columns(3)
 
-# 🟦 Card: QA Done
-with row1_col1:
-    left_points = ["Files passed in first iteration.", "Clean implementation.", "SOW understood."]
-    # The original logic for splitting points is fine, but for simplicity with 3 points, we'll keep it simple.
-    # The points can be displayed in a single column for this small list.
+    st.markdown("---")
 
-    st.markdown(f"""
-        <div class='hover-card' style='
-            background-color: #e0f7fa; /* Light Cyan */
-            padding: 20px;
-            border-radius: 10px;
-            color: #000;
-        '>
-        <h4 style='color: #004d40;'>✅ {selected_dept} Done - {done_count:,} files ({done_pct:.1f}%)</h4>
-        <div style="display: flex;">
-            <ul style='flex: 1;'>{''.join(f'<li>{pt}</li>' for pt in left_points)}</ul>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
 
-# 🟥 Card: QA Rejected
-with row1_col2:
-    left_points = ["Wrong platform logic", "Missing data points", "SOW mismatch"]
-    # Removed the complex `right_points` logic for visual simplicity in the card.
+month_sections(cube, data_version, selected_dept, available_months)
 
-    st.markdown(f"""
-        <div class='hover-card' style='
-            background-color: #ffebee; /* Light Red */
-            padding: 20px;
-            border-radius: 10px;
-            color: #000;
-        '>
-        <h4 style='color: #b71c1c;'>❌ {selected_dept} Rejected - {reject_count:,} files ({reject_pct:.1f}%)</h4>
-        <div style="display: flex;">
-            <ul style='flex: 1;'>
-                {''.join(f"<li>{point}</li>" for point in left_points)}
-            </ul>
-        </div>
-        </div>
-    """, unsafe_allow_html=True)
 
-# 🟧 Card: QA Revised
-with row1_col3:
-    left_points = ["Files resubmitted after correction.", "Revalidation impacts FTR.", "Second review required."]
-    # Removed the complex `right_points` logic for visual simplicity in the card.
+# --- FTR and rework across every month, by department, QA or frequency ---
+@st.fragment
+def trend_sections(cube, data_version, selected_dept):
+    profiler.lap("FTR & rework trend")
+    trend_analysis(cube, data_version, selected_dept)
+    if fragment_rerun:
+        profiling_panel()
 
-    st.markdown(f"""
-        <div class='hover-card' style='
-            background-color: #fff3e0; /* Light Orange */
-            padding: 20px;
-            border-radius: 10px;
-            color: #000;
-        '>
-        <h4 style='color: #e65100;'>🔄 {selected_dept} Revised - {revised_count:,} files ({revised_pct:.1f}%)</h4>
-        <div style="display: flex;">
-            <ul style='flex: 1;'>
-                {''.join(f"<li>{point}</li>" for point in left_points)}
-            </ul>
-        </div>
-        </div>
-    """, unsafe_allow_html=True)
 
+def trend_analysis(cube, data_version, selected_dept):
+    st.subheader(f"📈 {selected_dept} FTR & Rework Trend")
+    trends = profiler.cached("load_trends", load_trends, cube, data_version, selected_dept)
+    if trends["department"].empty:
+        st.info(f"No monthly data found for the {selected_dept} department.")
+        return
 
-# ---------------- ROW 2 (Summary and Action Points) ----------------
+    col1, col2, col3 = st.columns([0.25, 0.2, 0.55])
+    with col1:
+        view = st.radio("Trend by", ["Department", "QA", "Frequency"], horizontal=True)
+    if view == "Department":
+        fig = trend_figure(trends["department"])
+    else:
+        with col2:
+            metric = st.selectbox("Metric", ["FTR %", "Rework %"])
+        group_col = qa_col if view == "QA" else frequency_col
+        trend = trends["qa" if view == "QA" else "frequency"]
+        if view == "QA":
+            # Five busiest QAs by default; a line per QA for the whole team is unreadable.
+            busiest = trend.groupby(qa_col, observed=True)["Total"].sum().nlargest(5).index.tolist()
+            with col3:
+                chosen = st.multiselect(f"{selected_dept} members", options=sorted(trend[qa_col].unique()), default=busiest)
+            trend = trend[trend[qa_col].isin(chosen)]
+        fig = trend_figure(trend, group_col, metric)
+    st.plotly_chart(fig, use_container_width=True)
 
-# Using st.columns(2) directly for cleaner code structure without an outer container
-row2_col1, row2_col2 = st.columns(2)
+    st.markdown("---")
 
-# 🧠 Card Part 1: FTR % and Rework %
-with row2_col1:
-    ftr_pct = done_pct
-    st.markdown(f"""
-        <div class='hover-card' style='
-            background-color: #f3e5f5;
-            padding: 20px;
-            border-radius: 10px;
-            margin-top: 25px;
-        '>
-        <h4 style='color: #4a148c;'>📌 Key Performance Indicators</h4>
-        <ul style='color: #333;'>
-            <li><strong>First Time Right (FTR):</strong> <span style='font-size: 18px; color: #004d40;'>{ftr_pct:.1f}%</span></li>
-            <li><strong>Rework Required:</strong> <span style='font-size: 18px; color: #b71c1c;'>{rework_pct:.1f}%</span></li>
-            <li><strong>Total Files Reviewed:</strong> <span style='font-size: 18px;'>{total_files:,}</span></li>
-        </ul>
-        </div>
-    """, unsafe_allow_html=True)
 
-# 🛠️ Card Part 2: Developer Action Points
-with row2_col2:
-    st.markdown(f"""
-        <div class='hover-card' style='
-            background-color: #f3e5f5;
-            padding: 20px;
-            border-radius: 10px;
-            margin-top: 25px;
-        '>
-        <h4 style='color: #4a148c;'>🛠️ Action Plan & Focus Areas</h4>
-        <ul style='color: #333;'>
-            <li><strong>SOW Alignment:</strong> Clarify complex or ambiguous Statement of Work expectations.</li>
-            <li><strong>Root Cause Analysis:</strong> Investigate recurring "Rejected" issues with development team.</li>
-            <li><strong>Pre-{selected_dept} Checks:</strong> Implement developer-side validation steps to catch basic errors.</li>
-        </ul>
-        </div>
-    """, unsafe_allow_html=True)
-
-st.markdown("---")
+trend_sections(cube, data_version, selected_dept)
 
 
-# Columns expected: Frequency, QA Status
-# --- 🧹 Clean and standardize status column ---
-filtered[status_col] = filtered[status_col].astype(str).str.strip().str.lower()
-filtered[frequency_col] = filtered[frequency_col].astype(str).str.strip()
+# --- Date range analysis: any range of QA status days, compared with the one before it ---
+@st.fragment
+def range_sections(cube, data_version, selected_dept):
+    profiler.lap("Date range report")
+    range_analysis(cube, data_version, selected_dept)
+    if fragment_rerun:
+        profiling_panel()
 
-# --- 🧮 Group by Frequency and count Done/Reject ---
-summary = (
-    filtered
-    .groupby(frequency_col)[status_col]
-    .value_counts()
-    .unstack(fill_value=0)
-    .reset_index()
-)
 
-# --- ✅ Add missing columns if not present ---
-for col in ["qa done", "qa rejected"]:
-    if col not in summary.columns:
-        summary[col] = 0
-
-# --- ✅ Calculate totals and percentages (no decimals) ---
-summary["Total File"] = summary[["qa done", "qa rejected"]].sum(axis=1)
-summary["FTR%"] = (summary["qa done"] / summary["Total File"] * 100).round(0).astype(int)
-summary["Iteration%"] = (summary["qa rejected"] / summary["Total File"] * 100).round(0).astype(int)
-
-# --- 💬 Add comment based on volume ---
-def volume_comment(x):
-    if x > 100:
-        return "🔵 High volume"
-    elif x > 50:
-        return "🟢 Medium volume"
+def range_analysis(cube, data_version, selected_dept):
+    st.subheader(f"📆 {selected_dept} Date Range Analysis")
+    if isinstance(cube, QAStore):
+        bounds = cube.day_bounds(selected_dept)
+        report_for = cube.range_report
+    else:
+        totals = profiler.cached("daily_totals", daily_totals, cube, data_version)
+        dept_totals = totals.get(selected_dept)
+        bounds = (dept_totals.first_day, dept_totals.last_day) if dept_totals else None
+        report_for = lambda dept, start, end: range_report(totals, dept, start, end)
+    if bounds is None:
+        st.info(f"No QA status dates found for the {selected_dept} department.")
+        return
+    first_day, last_day = bounds
+
+    col1, col2 = st.columns([0.25, 0.75])
+    with col1:
+        preset = st.selectbox("Date Range", options=range_presets + ["Custom"], index=0)
+    if preset == "Custom":
+        with col2:
+            picked = st.date_input(
+                "Custom range",
+                value=(max(first_day, last_day - timedelta(days=29)), last_day),
+                min_value=first_day,
+                max_value=last_day,
+            )
+        if len(picked) != 2:
+            st.info("Pick the last day of the range.")
+            return
+        start, end = picked
     else:
-        return "🟠 Low volume"
-
-summary["Comment on Volume"] = summary["Total File"].apply(volume_comment)
-
-# --- ✨ Add footer row with totals ---
-footer = pd.DataFrame({
-    "Frequency (Sheet Name)": ["Total"],
-    "Total File": [summary["Total File"].sum()],
-    "FTR %": [""],  # optional: leave blank
-    "Iteration %": [""],  # optional: leave blank
-    "Comment on Volume": [""]
-})
-
-# --- ✨ Final formatted table ---
-summary_table = summary.rename(columns={
-    frequency_col: "Frequency (Sheet Name)",
-    "Total File": "Total File",
-    "FTR%": "FTR %",
-    "Iteration%": "Iteration %",
-    "Comment on Volume": "Comment on Volume"
-})[["Frequency (Sheet Name)", "Total File", "FTR %", "Iteration %", "Comment on Volume"]]
-
-# Append footer
-summary_table = pd.concat([summary_table, footer], ignore_index=True)
-
-# Apply background color
-styled_table = summary_table.style.set_properties(**{
-    'background-color': '#f0f8ff',  # light blue
-    'color': 'black',
-    'border-color': 'black'
-})
-
-# --- 🎨 Layout: Table (left) + Chart (right)
-col1, col2 = st.columns([1, 1])
-
-# --- LEFT: Table ---
-with col1:
-    st.markdown("### 📋 Frequency Summary Table")
-    table_height = int(38 * len(summary_table))  # approximate row height
-    st.dataframe(styled_table, height=table_height)
-
-
-
-# --- RIGHT: Bar Chart ---
-with col2:
-    st.markdown("### 📊 FTR% vs Iteration% by Frequency")
-
-    fig = go.Figure()
-
-    # ✅ FTR% Bar
-    fig.add_trace(go.Bar(
-        y=summary[frequency_col],
-        x=summary["FTR%"],  # <-- Using original column name
-        name="FTR %",
-        orientation='h',
-        marker_color="#28a745",
-        text=summary["FTR%"].astype(str) + "%",
-        textposition='outside'
-    ))
-
-    # ✅ Iteration% Bar
-    fig.add_trace(go.Bar(
-        y=summary[frequency_col],
-        x=summary["Iteration%"],
-        name="Iteration %",
-        orientation='h',
-        marker_color="#ff5733",
-        text=summary["Iteration%"].astype(str) + "%",
-        textposition='outside'
-    ))
-
-    # --- Chart layout styling ---
-    fig.update_layout(
-        barmode='group',
-        height=450,
-        plot_bgcolor='rgba(240,248,255,0.8)',
-        paper_bgcolor='rgba(255,255,255,0.8)',
-        xaxis_title="Percentage (%)",
-        yaxis_title="",
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=-0.25,
-            xanchor="center",
-            x=0.5
-        ),
-        margin=dict(l=40, r=20, t=40, b=40)
-    )
+        start, end = preset_range(preset, last_day)
+        with col2:
+            st.caption(f"Ranges end on the latest QA status date in the sheet ({last_day:%d %b %Y}).")
+
+    report = report_for(selected_dept, start, end)
+    before = report_for(selected_dept, *previous_range(start, end))
+    kpis, previous = report["kpis"], before["kpis"]
+    st.markdown(f"**{start:%d %b %Y} – {end:%d %b %Y}**, compared with the {(end - start).days + 1} days before")
+
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric(f"📊 Total Files ({selected_dept})", f"{kpis['total']:,}", delta=f"{kpis['total'] - previous['total']:+,}")
+    m2.metric("✅ First Time Right", f"{kpis['done_pct']:.1f}%", delta=f"{kpis['done_pct'] - previous['done_pct']:+.1f} pts")
+    m3.metric("❌ Rejected", f"{kpis['reject_pct']:.1f}%", delta=f"{kpis['reject_pct'] - previous['reject_pct']:+.1f} pts", delta_color="inverse")
+    m4.metric("🔄 Rework Required", f"{report['rework_pct']:.1f}%", delta=f"{report['rework_pct'] - before['rework_pct']:+.1f} pts", delta_color="inverse")
+
+    if kpis["total"] == 0:
+        st.info(f"No QA records found between {start:%d %b %Y} and {end:%d %b %Y} in the {selected_dept} department.")
+        return
+
+    profiler.lap("Date range chart & QA table")
+    col1, col2 = st.columns([0.6, 0.4])
+    with col1:
+        st.markdown(f"#### 📅 Daily {selected_dept} Files")
+        st.plotly_chart(daily_trend_figure(report["daily_counts"], start=report["start"]), use_container_width=True)
+    with col2:
+        st.markdown(f"#### 🧑‍💻 {selected_dept}-wise Summary")
+        st.dataframe(
+            report["qa_summary"].sort_values("Total", ascending=False),
+            use_container_width=True, hide_index=True, height=400,
+        )
 
-    st.plotly_chart(fig, use_container_width=True)
+    st.markdown("---")
 
 
-st.markdown("---")
+range_sections(cube, data_version, selected_dept)
+profiler.lap("Bad lines & footer")
+
+# --- Malformed sheet lines set aside at load time ---
+if not bad_lines.empty:
+    with st.expander(f"⚠️ {len(bad_lines)} malformed sheet line(s) were skipped while loading"):
+        st.dataframe(bad_lines, use_container_width=True)
 
 # --- Footer Logo & Caption ---
-footer_img_path = "D:/KSDB NANDAN/QA Desbord/monthy_web/img-2.png"
-if os.path.exists(footer_img_path):
-    footer_b64 = image_to_base64(footer_img_path)
+footer_img_path = asset_path(FOOTER_LOGO)
+footer_img_version = asset_version(footer_img_path)
+if footer_img_version is not None:
+    # Shown at 60 px and zoomed 3x on hover.
+    footer_mime, footer_b64 = profiler.cached("load_thumbnail", load_thumbnail, str(footer_img_path), footer_img_version, 60, scale=3)
     st.markdown(f"""
         <style>
             .footer-logo {{
@@ -1226,7 +1106,7 @@ if os.path.exists(footer_img_path):
                 📊 Data loaded from Google Sheets and filtered for the '<strong>{selected_dept}</strong>' Department.
             </div>
             <div style="display: flex; align-items: center; gap: 8px;">
-                <img class="footer-logo" src="data:image/png;base64,{footer_b64}" width="60" height="60" 
+                <img class="footer-logo" src="data:{footer_mime};base64,{footer_b64}" width="60" height="60" 
                      style="margin-top: 1px; border-radius: 50%; cursor: pointer;">
             </div>
         </div>
@@ -1234,9 +1114,5 @@ if os.path.exists(footer_img_path):
         <hr style="margin-top: 20px; margin-bottom: 10px;">
     """, unsafe_allow_html=True)
 
-
-
-
-
-
-
+profiling_panel()
+fragment_rerun = True